@@ -0,0 +1,27 @@
+"""sync batch stats
+
+Revision ID: 0002_sync_batch_stats
+Revises: 0001_initial_full_schema
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002_sync_batch_stats"
+down_revision = "0001_initial_full_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sync_metadata", sa.Column("batch_size", sa.Integer(), nullable=True))
+    op.add_column("sync_metadata", sa.Column("rows_synced", sa.Integer(), nullable=True))
+    op.add_column("sync_metadata", sa.Column("rows_per_second", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sync_metadata", "rows_per_second")
+    op.drop_column("sync_metadata", "rows_synced")
+    op.drop_column("sync_metadata", "batch_size")
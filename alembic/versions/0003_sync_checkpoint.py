@@ -0,0 +1,28 @@
+"""sync checkpoint
+
+Revision ID: 0003_sync_checkpoint
+Revises: 0002_sync_batch_stats
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_sync_checkpoint"
+down_revision = "0002_sync_batch_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sync_metadata", sa.Column("cursor_url", sa.String(), nullable=True))
+    op.add_column(
+        "sync_metadata",
+        sa.Column("cursor_changed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sync_metadata", "cursor_changed_at")
+    op.drop_column("sync_metadata", "cursor_url")
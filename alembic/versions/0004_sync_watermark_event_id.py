@@ -0,0 +1,25 @@
+"""sync watermark event id
+
+Revision ID: 0004_sync_watermark_event_id
+Revises: 0003_sync_checkpoint
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_sync_watermark_event_id"
+down_revision = "0003_sync_checkpoint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sync_metadata", sa.Column("last_event_id", sa.String(), nullable=True))
+    op.add_column("sync_metadata", sa.Column("cursor_event_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sync_metadata", "cursor_event_id")
+    op.drop_column("sync_metadata", "last_event_id")
@@ -0,0 +1,26 @@
+"""events keyset index
+
+Revision ID: 0005_events_keyset_index
+Revises: 0004_sync_watermark_event_id
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_events_keyset_index"
+down_revision = "0004_sync_watermark_event_id"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (event_time, id) покрывает и сортировку списка, и фильтр по event_time,
+    # поэтому одиночный индекс по event_time больше не нужен.
+    op.create_index("ix_events_event_time_id", "events", ["event_time", "id"])
+    op.drop_index("ix_events_event_time", table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_event_time", "events", ["event_time"])
+    op.drop_index("ix_events_event_time_id", table_name="events")
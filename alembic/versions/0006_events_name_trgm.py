@@ -0,0 +1,30 @@
+"""events name trigram index
+
+Revision ID: 0006_events_name_trgm
+Revises: 0005_events_keyset_index
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_events_name_trgm"
+down_revision = "0005_events_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GIN-индекс по триграммам обслуживает ILIKE '%...%' без seq scan.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_events_name_trgm",
+        "events",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_name_trgm", table_name="events")
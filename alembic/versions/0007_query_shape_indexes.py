@@ -0,0 +1,41 @@
+"""query shape indexes
+
+Revision ID: 0007_query_shape_indexes
+Revises: 0006_events_name_trgm
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_query_shape_indexes"
+down_revision = "0006_events_name_trgm"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ----- events -----
+    op.create_index(
+        "ix_events_status_event_time_id", "events", ["status", "event_time", "id"]
+    )
+    op.create_index(
+        "ix_events_published_event_time_id",
+        "events",
+        ["event_time", "id"],
+        postgresql_where=sa.text("status = 'published'"),
+    )
+    op.create_index("ix_events_place_id", "events", ["place_id"])
+
+    # ----- tickets -----
+    op.create_index("ix_tickets_event_id", "tickets", ["event_id"])
+    op.create_index("ix_tickets_ticket_id", "tickets", ["ticket_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tickets_ticket_id", table_name="tickets")
+    op.drop_index("ix_tickets_event_id", table_name="tickets")
+    op.drop_index("ix_events_place_id", table_name="events")
+    op.drop_index("ix_events_published_event_time_id", table_name="events")
+    op.drop_index("ix_events_status_event_time_id", table_name="events")
@@ -0,0 +1,30 @@
+"""cache entries
+
+Revision ID: 0008_cache_entries
+Revises: 0007_query_shape_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0008_cache_entries"
+down_revision = "0007_query_shape_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_entries",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("value", postgresql.JSONB(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        prefixes=["UNLOGGED"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cache_entries")
@@ -0,0 +1,26 @@
+"""sync version
+
+Revision ID: 0009_sync_version
+Revises: 0008_cache_entries
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_sync_version"
+down_revision = "0008_cache_entries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sync_metadata",
+        sa.Column("sync_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sync_metadata", "sync_version")
@@ -0,0 +1,25 @@
+"""sync progress
+
+Revision ID: 0010_sync_progress
+Revises: 0009_sync_version
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_sync_progress"
+down_revision = "0009_sync_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sync_metadata", sa.Column("pages_synced", sa.Integer(), nullable=True))
+    op.add_column("sync_metadata", sa.Column("rows_total", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sync_metadata", "rows_total")
+    op.drop_column("sync_metadata", "pages_synced")
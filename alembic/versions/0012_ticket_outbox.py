@@ -0,0 +1,51 @@
+"""ticket outbox
+
+Revision ID: 0012_ticket_outbox
+Revises: 0011_idempotency_keys
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012_ticket_outbox"
+down_revision = "0011_idempotency_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("tickets", "ticket_id", existing_type=sa.String(), nullable=True)
+    op.add_column(
+        "tickets",
+        sa.Column("status", sa.String(), nullable=False, server_default="registered"),
+    )
+    op.add_column("tickets", sa.Column("error", sa.String(), nullable=True))
+
+    op.create_table(
+        "ticket_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "ticket_local_id",
+            sa.String(),
+            sa.ForeignKey("tickets.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+    )
+    op.create_index(
+        "ix_ticket_outbox_next_attempt_at", "ticket_outbox", ["next_attempt_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ticket_outbox_next_attempt_at", table_name="ticket_outbox")
+    op.drop_table("ticket_outbox")
+    op.drop_column("tickets", "error")
+    op.drop_column("tickets", "status")
+    op.execute("DELETE FROM tickets WHERE ticket_id IS NULL")
+    op.alter_column("tickets", "ticket_id", existing_type=sa.String(), nullable=False)
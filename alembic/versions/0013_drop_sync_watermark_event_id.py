@@ -0,0 +1,25 @@
+"""drop sync watermark event id
+
+Revision ID: 0013_drop_sync_watermark_event_id
+Revises: 0012_ticket_outbox
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0013_drop_sync_watermark_event_id"
+down_revision = "0012_ticket_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_column("sync_metadata", "cursor_event_id")
+    op.drop_column("sync_metadata", "last_event_id")
+
+
+def downgrade() -> None:
+    op.add_column("sync_metadata", sa.Column("last_event_id", sa.String(), nullable=True))
+    op.add_column("sync_metadata", sa.Column("cursor_event_id", sa.String(), nullable=True))
@@ -0,0 +1,102 @@
+"""Сравнение сериализации страницы GET /api/events (100 событий).
+
+orm  — ORM-объекты с selectinload, EventListItem.model_validate, jsonable_encoder, json;
+lean — строки EVENT_LIST_COLUMNS одним JOIN, dict, orjson.
+
+Запуск: python -m benchmarks.bench_event_list
+"""
+from __future__ import annotations
+
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("EVENTS_API_URL", "http://bench.local")
+os.environ.setdefault("EVENTS_API_KEY", "bench")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+
+from src.api.response_cache import dumps  # noqa: E402
+from src.domain.models import Event, Place  # noqa: E402
+from src.domain.schemas.event import EventListItem, event_list_item_from_row  # noqa: E402
+from src.infrastructure.db.repositories.event_repository import EVENT_LIST_COLUMNS  # noqa: E402
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def seed(session: Session) -> None:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    places = [
+        Place(
+            id=f"place-{i}",
+            name=f"Hall {i}",
+            city="Moscow",
+            address=f"Tverskaya {i}",
+            seats_pattern="A1-100,B1-100",
+            changed_at=now,
+            created_at=now,
+        )
+        for i in range(10)
+    ]
+    session.add_all(places)
+    session.add_all(
+        Event(
+            id=f"event-{i:05d}",
+            name=f"Concert {i}",
+            event_time=now + timedelta(hours=i),
+            registration_deadline=now + timedelta(hours=i - 2),
+            status="published",
+            number_of_visitors=i % 300,
+            changed_at=now,
+            created_at=now,
+            status_changed_at=now,
+            place_id=f"place-{i % 10}",
+        )
+        for i in range(1000)
+    )
+    session.commit()
+
+
+def orm_page(session: Session) -> bytes:
+    events = session.scalars(
+        select(Event)
+        .options(selectinload(Event.place))
+        .order_by(Event.event_time, Event.id)
+        .limit(PAGE_SIZE)
+    ).all()
+    payload = {"results": [EventListItem.model_validate(e) for e in events]}
+    body = JSONResponse(content=jsonable_encoder(payload)).body
+    session.expunge_all()
+    return body
+
+
+def lean_page(session: Session) -> bytes:
+    rows = session.execute(
+        select(*EVENT_LIST_COLUMNS)
+        .join(Place, Event.place_id == Place.id)
+        .order_by(Event.event_time, Event.id)
+        .limit(PAGE_SIZE)
+    ).all()
+    return dumps({"results": [event_list_item_from_row(r) for r in rows]})
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    Place.__table__.create(engine)
+    Event.__table__.create(engine)
+    with Session(engine) as session:
+        seed(session)
+
+    with Session(engine) as session:
+        for name, fn in (("orm", orm_page), ("lean", lean_page)):
+            fn(session)
+            seconds = min(timeit.repeat(lambda: fn(session), number=ROUNDS, repeat=3))
+            print(f"{name:>5}: {seconds / ROUNDS * 1000:.3f} ms/page ({PAGE_SIZE} items)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Awaitable, Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from src.infrastructure.cache.seats_cache import InMemoryCache
+
+
+class ResponseCache:
+    """Готовые JSON-ответы GET-эндпоинтов, привязанные к поколению синхронизации.
+
+    Данные меняются только при синхронизации, поэтому ключ включает sync_version
+    (она растёт с каждым закоммиченным батчем): старые записи перестают
+    запрашиваться и вытесняются LRU. Конечный ttl ограничивает жизнь ответа,
+    собранного с отстающей реплики уже под новым поколением. ETag позволяет
+    клиентам и прокси получать 304.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_age: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries = InMemoryCache(max_entries=max_entries, clock=clock)
+        self._max_age = max_age
+        self._ttl = ttl
+
+    async def respond(
+        self,
+        request: Request,
+        generation: int | None,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        key = self._key(request, generation) if generation is not None else None
+        cached = await self._entries.get(key) if key else None
+        if cached is not None:
+            etag, body = cached
+        else:
+            body = dumps(await build())
+            etag = self._etag(generation, body)
+            if key:
+                await self._entries.set(key, (etag, body), ttl=self._ttl)
+
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={self._max_age}"}
+        if _etag_matches(etag, request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _key(request: Request, generation: int) -> str:
+        # Ссылки next/previous абсолютные, поэтому хост тоже часть ключа.
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{generation}|{request.base_url}|{request.url.path}?{params}"
+
+    @staticmethod
+    def _etag(generation: int | None, body: bytes) -> str:
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        return f'"{generation if generation is not None else "x"}-{digest}"'
+
+
+def dumps(payload: Any) -> bytes:
+    """orjson напрямую в байты; незнакомое orjson (pydantic и т.п.) — через jsonable_encoder."""
+    return orjson.dumps(payload, default=jsonable_encoder, option=orjson.OPT_UTC_Z)
+
+
+def _etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        from src.core.config import settings
+        _response_cache = ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            max_age=settings.response_cache_max_age,
+            ttl=settings.response_cache_ttl_seconds,
+        )
+    return _response_cache
@@ -1,35 +1,78 @@
 from __future__ import annotations
 
+import base64
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.schemas.event import EventListItem, EventResponse, TicketCreateRequest
+from src.api.response_cache import ResponseCache, get_response_cache
+from src.core.config import settings
+from src.domain.schemas.event import (
+    EventResponse,
+    TicketBatchCancelRequest,
+    TicketBatchCreateRequest,
+    TicketCreateRequest,
+    event_list_item_from_row,
+)
+from src.infrastructure.cache.seats_cache import SeatsCache, get_seats_cache
 from src.infrastructure.clients.events_provider import EventsProviderClient, get_events_client
+from src.infrastructure.clients.resilience import (
+    ProviderRejected,
+    ProviderTemporaryError,
+    ProviderUnavailable,
+)
 from src.infrastructure.db.repositories.event_repository import SqlAlchemyEventRepository
+from src.infrastructure.db.repositories.outbox_repository import SqlAlchemyTicketOutboxRepository
 from src.infrastructure.db.repositories.ticket_repository import SqlAlchemyTicketRepository
-from src.infrastructure.db.session import get_session
+from src.infrastructure.db.session import get_read_session, get_session
+from src.services.event_status_index import EventStatusIndex, get_event_status_index
+from src.services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyStore,
+    fingerprint,
+    get_idempotency_store,
+)
 from src.usecases.tickets import (
+    BatchCancelTicketsUsecase,
+    BatchCreateTicketsUsecase,
     CancelTicketUsecase,
     CreateTicketUsecase,
+    EnqueueTicketUsecase,
     EventNotFound,
     EventNotPublished,
     RegistrationDeadlinePassed,
     TicketNotFound,
+    TicketRegistrationPending,
+    TicketRegistrationUnknown,
 )
 
 logger = logging.getLogger(__name__)
 
-SEATS_CACHE_TTL = 30  # seconds
-_seats_cache: dict[str, dict] = {}
-
 router = APIRouter(prefix="/api", tags=["events"])
 
 
 
+def _encode_cursor(event_time: datetime, event_id: str) -> str:
+    raw = json.dumps([event_time.isoformat(), event_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        event_time, event_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(event_time), str(event_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/events")
 async def list_events(
     request: Request,
@@ -39,56 +82,127 @@ async def list_events(
     status: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = Query(
+        None, description="Курсор keyset-пагинации; пустое значение — первая страница"
+    ),
+    count: Literal["exact", "window", "estimate", "none"] = Query(
+        "exact",
+        description=(
+            "exact — точно, window — точно одним запросом (окно), "
+            "estimate — оценка планировщика, none — без подсчёта"
+        ),
+    ),
+    sort: Literal["event_time", "relevance"] = Query(
+        "event_time", description="relevance — по близости названия к name (только постранично)"
+    ),
+    session: AsyncSession = Depends(get_read_session),
+    statuses: EventStatusIndex = Depends(get_event_status_index),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
     from datetime import date
 
     date_from_parsed = date.fromisoformat(date_from) if date_from else None
     date_to_parsed = date.fromisoformat(date_to) if date_to else None
 
-    repo = SqlAlchemyEventRepository(session)
-    total, events = await repo.list(
-        name=name,
-        status=status,
-        date_from=date_from_parsed,
-        date_to=date_to_parsed,
-        page=page,
-        page_size=page_size,
-    )
-
     base_url = str(request.url).split("?")[0]
 
-    def build_url(p: int) -> str:
-        url = f"{base_url}?page={p}&page_size={page_size}"
+    def build_url(**params) -> str:
+        query = {"page_size": page_size, **params}
+        if count != "exact":
+            query["count"] = count
+        if sort != "event_time":
+            query["sort"] = sort
         if date_from:
-            url += f"&date_from={date_from}"
+            query["date_from"] = date_from
         if date_to:
-            url += f"&date_to={date_to}"
+            query["date_to"] = date_to
         if name:
-            url += f"&name={name}"
+            query["name"] = name
         if status:
-            url += f"&status={status}"
-        return url
+            query["status"] = status
+        return f"{base_url}?{urlencode(query)}"
+
+    async def build() -> dict:
+        repo = SqlAlchemyEventRepository(session)
+        filters = dict(
+            name=name,
+            status=status,
+            date_from=date_from_parsed,
+            date_to=date_to_parsed,
+        )
 
-    return {
-        "count": total,
-        "next": build_url(page + 1) if page * page_size < total else None,
-        "previous": build_url(page - 1) if page > 1 else None,
-        "results": [EventListItem.model_validate(e) for e in events],
-    }
+        if cursor is not None:
+            after = _decode_cursor(cursor) if cursor else None
+            total = None
+            if count in ("exact", "window"):
+                total = await repo.count(**filters)
+            elif count == "estimate":
+                total = await repo.estimate_count(**filters)
+            events = await repo.list_after(after=after, limit=page_size + 1, lean=True, **filters)
+            has_next = len(events) > page_size
+            events = events[:page_size]
+            last = events[-1] if events else None
+            return {
+                "count": total,
+                "next": (
+                    build_url(cursor=_encode_cursor(last.event_time, last.id)) if has_next else None
+                ),
+                "previous": None,
+                "results": [event_list_item_from_row(e) for e in events],
+            }
+
+        by_relevance = sort == "relevance"
+        if count in ("exact", "window"):
+            total, events = await repo.list(
+                page=page,
+                page_size=page_size,
+                count_mode=count,
+                by_relevance=by_relevance,
+                lean=True,
+                **filters,
+            )
+            has_next = page * page_size < total
+        else:
+            # Без точного total о следующей странице говорит лишняя строка в выборке.
+            total, events = await repo.list(
+                page=page,
+                page_size=page_size,
+                count_mode=count,
+                lookahead=1,
+                by_relevance=by_relevance,
+                lean=True,
+                **filters,
+            )
+            has_next = len(events) > page_size
+            events = events[:page_size]
+
+        return {
+            "count": total,
+            "next": build_url(page=page + 1) if has_next else None,
+            "previous": build_url(page=page - 1) if page > 1 else None,
+            "results": [event_list_item_from_row(e) for e in events],
+        }
+
+    return await response_cache.respond(request, statuses.version, build)
 
 
 
 @router.get("/events/{event_id}", response_model=EventResponse)
 async def get_event(
+    request: Request,
     event_id: str = Path(...),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
+    statuses: EventStatusIndex = Depends(get_event_status_index),
+    response_cache: ResponseCache = Depends(get_response_cache),
 ):
-    repo = SqlAlchemyEventRepository(session)
-    event = await repo.get_by_id(event_id)
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    async def build() -> EventResponse:
+        repo = SqlAlchemyEventRepository(session)
+        event = await repo.get_by_id(event_id)
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return EventResponse.model_validate(event)
+
+    return await response_cache.respond(request, statuses.version, build)
 
 
 
@@ -97,31 +211,36 @@ async def get_event_seats(
     event_id: str = Path(...),
     session: AsyncSession = Depends(get_session),
     events_client: EventsProviderClient = Depends(get_events_client),
+    seats_cache: SeatsCache = Depends(get_seats_cache),
+    statuses: EventStatusIndex = Depends(get_event_status_index),
 ):
-    now = datetime.utcnow()
-
-    cached = _seats_cache.get(event_id)
-    if cached and cached["expires_at"] > now:
-        return {"event_id": event_id, "available_seats": cached["seats"]}
-
-    repo = SqlAlchemyEventRepository(session)
-    event = await repo.get_by_id(event_id)
+    cached = await seats_cache.get(event_id)
+    if cached is not None:
+        return {"event_id": event_id, "available_seats": cached}
+
+    event = statuses.get(event_id)
+    if event is None:
+        # Событие могло появиться после последнего обновления индекса.
+        event = await SqlAlchemyEventRepository(session).get_by_id(event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     if event.status != "published":
         raise HTTPException(status_code=400, detail="Event is not published")
 
     try:
-        seats = await events_client.seats(event_id)
+        seats = await seats_cache.get_or_load(event_id, lambda: events_client.seats(event_id))
+    except ProviderUnavailable:
+        stale = await seats_cache.get_stale(event_id)
+        if stale is None:
+            raise HTTPException(status_code=503, detail="Events provider is unavailable")
+        return JSONResponse(
+            {"event_id": event_id, "available_seats": stale},
+            headers={"X-Stale-Data": "true"},
+        )
     except Exception as exc:
         logger.exception("Failed to fetch seats for event %s", event_id)
         raise HTTPException(status_code=502, detail=f"Failed to fetch seats: {exc}")
 
-    _seats_cache[event_id] = {
-        "seats": seats,
-        "expires_at": now + timedelta(seconds=SEATS_CACHE_TTL),
-    }
-
     return {"event_id": event_id, "available_seats": seats}
 
 
@@ -129,13 +248,117 @@ async def get_event_seats(
 @router.post("/tickets", status_code=201)
 async def create_ticket(
     payload: TicketCreateRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     session: AsyncSession = Depends(get_session),
     events_client: EventsProviderClient = Depends(get_events_client),
+    seats_cache: SeatsCache = Depends(get_seats_cache),
+    statuses: EventStatusIndex = Depends(get_event_status_index),
+    idempotency: IdempotencyStore = Depends(get_idempotency_store),
+    prefer: Optional[str] = Header(None),
 ):
+    # Prefer: respond-async (RFC 7240) — регистрация через outbox, ответ 202.
+    respond_async = prefer is not None and "respond-async" in prefer.lower()
+
+    async def run() -> tuple[int, dict]:
+        if respond_async:
+            return await _enqueue_ticket(payload, session, statuses)
+        return await _create_ticket(payload, session, events_client, seats_cache, statuses)
+
+    if idempotency_key is None:
+        return _ticket_response(*await run())
+
+    request = payload.model_dump(mode="json")
+    if respond_async:
+        # Режим ответа — часть запроса: синхронный повтор не должен получить
+        # сохранённый 202 «pending», и наоборот.
+        request["prefer"] = "respond-async"
+    try:
+        stored = await idempotency.begin(idempotency_key, fingerprint(request))
+    except IdempotencyKeyMismatch:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request",
+        )
+    except IdempotencyKeyInProgress:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+    if stored is not None:
+        return _ticket_response(
+            stored.status_code, stored.body, {"Idempotent-Replayed": "true"}
+        )
+
+    try:
+        status_code, body = await run()
+    except HTTPException as exc:
+        # 4xx детерминированы — запоминаем; 5xx повтор должен выполнить заново.
+        if exc.status_code < 500:
+            await idempotency.complete(idempotency_key, exc.status_code, {"detail": exc.detail})
+        else:
+            await idempotency.release(idempotency_key)
+        raise
+    except BaseException:
+        await idempotency.release(idempotency_key)
+        raise
+    await idempotency.complete(idempotency_key, status_code, body)
+    return _ticket_response(status_code, body)
+
+
+def _ticket_response(
+    status_code: int, body: dict, headers: dict[str, str] | None = None
+) -> JSONResponse:
+    headers = dict(headers or {})
+    if status_code == 202:
+        headers["Preference-Applied"] = "respond-async"
+        headers["Location"] = f"/api/tickets/{body['id']}"
+    return JSONResponse(body, status_code=status_code, headers=headers)
+
+
+async def _enqueue_ticket(
+    payload: TicketCreateRequest,
+    session: AsyncSession,
+    statuses: EventStatusIndex,
+) -> tuple[int, dict]:
+    usecase = EnqueueTicketUsecase(
+        events=SqlAlchemyEventRepository(session),
+        tickets=SqlAlchemyTicketRepository(session),
+        outbox=SqlAlchemyTicketOutboxRepository(session),
+        statuses=statuses,
+    )
+
+    try:
+        local_id = await usecase.execute(
+            event_id=payload.event_id,
+            first_name=payload.first_name,
+            last_name=payload.last_name,
+            email=str(payload.email),
+            seat=payload.seat,
+        )
+        await session.commit()
+    except EventNotFound:
+        raise HTTPException(status_code=404, detail="Event not found")
+    except EventNotPublished:
+        raise HTTPException(status_code=400, detail="Event is not published")
+    except RegistrationDeadlinePassed:
+        raise HTTPException(status_code=400, detail="Registration deadline has passed")
+
+    return 202, {"id": local_id, "status": "pending"}
+
+
+async def _create_ticket(
+    payload: TicketCreateRequest,
+    session: AsyncSession,
+    events_client: EventsProviderClient,
+    seats_cache: SeatsCache,
+    statuses: EventStatusIndex,
+) -> tuple[int, dict]:
     usecase = CreateTicketUsecase(
         client=events_client,
         events=SqlAlchemyEventRepository(session),
         tickets=SqlAlchemyTicketRepository(session),
+        statuses=statuses,
+        transaction=session,
     )
 
     try:
@@ -153,38 +376,170 @@ async def create_ticket(
         raise HTTPException(status_code=400, detail="Event is not published")
     except RegistrationDeadlinePassed:
         raise HTTPException(status_code=400, detail="Registration deadline has passed")
-    except ValueError as exc:
+    except ProviderRejected as exc:
+        # Единственный отказ провайдера, который можно запомнить под Idempotency-Key.
         raise HTTPException(status_code=400, detail=str(exc))
+    except ProviderUnavailable:
+        await session.rollback()
+        raise HTTPException(status_code=503, detail="Events provider is unavailable")
+    except ProviderTemporaryError as exc:
+        await session.rollback()
+        status_code = 503 if exc.status_code in (429, 503) else 502
+        raise HTTPException(status_code=status_code, detail=str(exc))
     except Exception as exc:
         await session.rollback()
         logger.exception("Ticket creation failed")
         raise HTTPException(status_code=502, detail=str(exc))
 
-    return {"ticket_id": ticket_id}
+    await seats_cache.invalidate(payload.event_id)
+    return 201, {"ticket_id": ticket_id}
+
+
+
+@router.get("/tickets/{ticket_id}")
+async def get_ticket(
+    ticket_id: str = Path(...),
+    session: AsyncSession = Depends(get_session),
+):
+    # Статус опрашивают сразу после записи, поэтому читаем из primary.
+    ticket = await SqlAlchemyTicketRepository(session).get_by_local_id(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return {
+        "id": ticket.id,
+        "event_id": ticket.event_id,
+        "ticket_id": ticket.ticket_id,
+        "status": ticket.status,
+        "seat": ticket.seat,
+        "error": ticket.error,
+    }
+
+
+@router.post("/tickets/batch")
+async def create_tickets_batch(
+    payload: TicketBatchCreateRequest,
+    session: AsyncSession = Depends(get_session),
+    events_client: EventsProviderClient = Depends(get_events_client),
+    seats_cache: SeatsCache = Depends(get_seats_cache),
+    statuses: EventStatusIndex = Depends(get_event_status_index),
+):
+    usecase = BatchCreateTicketsUsecase(
+        client=events_client,
+        events=SqlAlchemyEventRepository(session),
+        tickets=SqlAlchemyTicketRepository(session),
+        concurrency=settings.provider_register_concurrency,
+        statuses=statuses,
+        transaction=session,
+    )
+
+    try:
+        results = await usecase.execute(
+            payload.event_id,
+            [
+                {
+                    "first_name": item.first_name,
+                    "last_name": item.last_name,
+                    "email": str(item.email),
+                    "seat": item.seat,
+                }
+                for item in payload.tickets
+            ],
+        )
+        await session.commit()
+    except EventNotFound:
+        raise HTTPException(status_code=404, detail="Event not found")
+    except EventNotPublished:
+        raise HTTPException(status_code=400, detail="Event is not published")
+    except RegistrationDeadlinePassed:
+        raise HTTPException(status_code=400, detail="Registration deadline has passed")
+    except Exception as exc:
+        await session.rollback()
+        logger.exception("Batch ticket creation failed")
+        raise HTTPException(status_code=502, detail=str(exc))
+
+    if any(result.ticket_id for result in results):
+        await seats_cache.invalidate(payload.event_id)
+    return {
+        "event_id": payload.event_id,
+        "results": [
+            {
+                "seat": result.seat,
+                "status": "created" if result.ticket_id else "failed",
+                "ticket_id": result.ticket_id,
+                "error": result.error,
+            }
+            for result in results
+        ],
+    }
 
 
+@router.post("/tickets/batch/cancel")
+async def cancel_tickets_batch(
+    payload: TicketBatchCancelRequest,
+    session: AsyncSession = Depends(get_session),
+    events_client: EventsProviderClient = Depends(get_events_client),
+    seats_cache: SeatsCache = Depends(get_seats_cache),
+):
+    usecase = BatchCancelTicketsUsecase(
+        client=events_client,
+        tickets=SqlAlchemyTicketRepository(session),
+        concurrency=settings.provider_register_concurrency,
+        transaction=session,
+    )
+
+    try:
+        results = await usecase.execute(payload.ticket_ids)
+        await session.commit()
+    except Exception as exc:
+        await session.rollback()
+        logger.exception("Batch ticket cancellation failed")
+        raise HTTPException(status_code=502, detail=str(exc))
+
+    for event_id in {result.event_id for result in results if result.error is None}:
+        await seats_cache.invalidate(event_id)
+    return {
+        "results": [
+            {
+                "ticket_id": result.ticket_id,
+                "status": "cancelled" if result.error is None else "failed",
+                "error": result.error,
+            }
+            for result in results
+        ],
+    }
+
 
 @router.delete("/tickets/{ticket_id}")
 async def delete_ticket(
     ticket_id: str = Path(...),
     session: AsyncSession = Depends(get_session),
     events_client: EventsProviderClient = Depends(get_events_client),
+    seats_cache: SeatsCache = Depends(get_seats_cache),
 ):
     usecase = CancelTicketUsecase(
         client=events_client,
         tickets=SqlAlchemyTicketRepository(session),
+        transaction=session,
     )
 
     try:
-        await usecase.execute(ticket_id)
+        event_id = await usecase.execute(ticket_id)
         await session.commit()
     except TicketNotFound:
         raise HTTPException(status_code=404, detail="Ticket not found")
+    except TicketRegistrationPending:
+        raise HTTPException(status_code=409, detail="Ticket registration is still pending")
+    except TicketRegistrationUnknown:
+        raise HTTPException(status_code=409, detail="Ticket registration outcome is unknown")
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    except ProviderUnavailable:
+        await session.rollback()
+        raise HTTPException(status_code=503, detail="Events provider is unavailable")
     except Exception as exc:
         await session.rollback()
         logger.exception("Ticket cancellation failed")
         raise HTTPException(status_code=502, detail=str(exc))
 
+    await seats_cache.invalidate(event_id)
     return {"success": True}
\ No newline at end of file
@@ -2,27 +2,76 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.infrastructure.clients.events_provider import get_events_client
+from src.domain.models import SyncMetadata
+from src.infrastructure.db.repositories.sync_repository import SyncMetadataRepository
 from src.infrastructure.db.session import get_session
-from src.services.sync_service import SyncService
+from src.services.sync_jobs import SyncJob, SyncJobRunner, get_sync_job_runner
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/sync", tags=["sync"])
 
 
-@router.post("/trigger")
+@router.post("/trigger", status_code=202)
 async def trigger_sync(
+    runner: SyncJobRunner = Depends(get_sync_job_runner),
+):
+    """Ставит синхронизацию в фон; если она уже идёт, возвращает текущее задание."""
+    job = runner.start()
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/status")
+async def sync_status(
+    job_id: str | None = Query(None),
     session: AsyncSession = Depends(get_session),
+    runner: SyncJobRunner = Depends(get_sync_job_runner),
 ):
-    client = get_events_client()
-    service = SyncService(client=client, session=session)
-    try:
-        await service.run()
-    except Exception as exc:
-        logger.exception("Manual sync failed")
-        raise HTTPException(status_code=500, detail=f"Sync failed: {exc}")
-    return {"status": "ok"}
\ No newline at end of file
+    # Прогресс пишется после каждого батча, поэтому читаем из primary, а не из реплики.
+    meta = await SyncMetadataRepository(session).get()
+    payload = _progress(meta)
+    if job_id is not None:
+        job = runner.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Sync job not found")
+        payload["job"] = _job_payload(job)
+    return payload
+
+
+def _progress(meta: SyncMetadata | None) -> dict:
+    if meta is None:
+        return {"status": "never", "last_sync_time": None, "pages_synced": 0,
+                "rows_synced": 0, "rows_total": None, "rows_per_second": None,
+                "batch_size": None, "eta_seconds": None}
+
+    eta = None
+    if (
+        meta.sync_status == "running"
+        and meta.rows_total is not None
+        and meta.rows_per_second
+    ):
+        remaining = max(meta.rows_total - (meta.rows_synced or 0), 0)
+        eta = round(remaining / meta.rows_per_second, 1)
+    return {
+        "status": meta.sync_status,
+        "last_sync_time": meta.last_sync_time,
+        "pages_synced": meta.pages_synced or 0,
+        "rows_synced": meta.rows_synced or 0,
+        "rows_total": meta.rows_total,
+        "rows_per_second": meta.rows_per_second,
+        "batch_size": meta.batch_size,
+        "eta_seconds": eta,
+    }
+
+
+def _job_payload(job: SyncJob) -> dict:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+    }
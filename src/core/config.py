@@ -4,12 +4,112 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     database_url: str = ""
     postgres_connection_string: str = ""
+    database_read_url: str = ""
     events_api_url: str
     events_api_key: str
 
+    # SQLAlchemy engine / пул соединений
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
+    db_warmup_connections: int = 5
+    # Сколько секунд после синхронизации читать из primary вместо реплики
+    read_your_writes_seconds: float = 10.0
+
+    # HTTP-клиент Events Provider API (один на приложение, живёт в lifespan)
+    provider_http2: bool = False
+    provider_max_connections: int = 100
+    provider_max_keepalive_connections: int = 20
+    provider_keepalive_expiry: float = 30.0
+    provider_connect_timeout: float = 5.0
+    provider_read_timeout: float = 10.0
+    provider_write_timeout: float = 10.0
+    provider_pool_timeout: float = 5.0
+    # Общий дедлайн одной попытки по типу вызова (поверх таймаутов httpx)
+    provider_events_timeout: float = 30.0
+    provider_seats_timeout: float = 5.0
+    provider_tickets_timeout: float = 15.0
+    # Повторы только для GET; задержка — full jitter от base * 2^n, не больше max
+    provider_retry_attempts: int = 3
+    provider_retry_base_delay: float = 0.2
+    provider_retry_max_delay: float = 5.0
+    # Token bucket на исходящие запросы воркера; 0 — без ограничения
+    provider_max_qps: float = 50.0
+    provider_burst: int = 20
+    # Circuit breaker: после N сбоев подряд запросы отклоняются на reset секунд
+    provider_breaker_failures: int = 5
+    provider_breaker_reset_seconds: float = 30.0
+    # Сколько регистраций/отмен одной групповой заявки отправлять провайдеру одновременно
+    provider_register_concurrency: int = 10
+
+    sync_batch_size: int = 500
+    sync_prefetch_pages: int = 2
+    # Разбирать страницы провайдера потоком: строки идут в батчи, не дожидаясь
+    # конца страницы; упреждающее чтение страниц (prefetch) при этом не работает.
+    sync_stream_pages: bool = False
+    # Инкрементальная синхронизация запрашивает изменения с небольшим
+    # запасом до водяного знака, чтобы не потерять поздно записанные строки.
+    sync_watermark_overlap_seconds: int = 300
+
+    # Планировщик: интервал между min и max в зависимости от числа изменений
+    # в прошлой синхронизации; при sync_busy_changes и больше — min.
+    sync_min_interval_seconds: float = 300.0
+    sync_max_interval_seconds: float = 24 * 60 * 60
+    sync_busy_changes: int = 1_000
+    sync_failure_backoff_seconds: float = 30.0
+    sync_jitter: float = 0.1
+    # Как часто не-лидеры пробуют занять лидерство
+    sync_leader_retry_seconds: float = 60.0
+
+    # Кэш свободных мест: "memory" — только в процессе, "postgres" — общий для воркеров
+    seats_cache_backend: str = "memory"
+    seats_cache_ttl: float = 30.0
+    seats_cache_local_ttl: float = 5.0
+    seats_cache_max_entries: int = 10_000
+    # Сколько хранить последний известный ответ для отдачи при открытом breaker
+    seats_cache_stale_ttl: float = 600.0
+
+    # Как часто воркер сверяет sync_version и дочитывает индекс статусов событий
+    event_status_index_poll_seconds: float = 5.0
+
+    # Idempotency-Key для POST /api/tickets: сколько хранить ответ, сколько живёт
+    # замок выполняющегося запроса и сколько повтор ждёт его завершения
+    idempotency_ttl_seconds: float = 24 * 60 * 60
+    idempotency_lock_seconds: float = 60.0
+    idempotency_wait_seconds: float = 30.0
+    idempotency_cleanup_interval_seconds: float = 60 * 60
+
+    # Асинхронная регистрация (Prefer: respond-async): диспетчер ticket_outbox
+    tickets_outbox_batch_size: int = 50
+    tickets_outbox_concurrency: int = 10
+    tickets_outbox_poll_seconds: float = 1.0
+    # Аренда берётся на одну запись прямо перед вызовом провайдера и должна
+    # быть заметно длиннее provider_tickets_timeout.
+    tickets_outbox_lease_seconds: float = 60.0
+    tickets_outbox_retry_seconds: float = 5.0
+    tickets_outbox_max_attempts: int = 5
+
+    # Кэш ответов GET /api/events*, ключ включает sync_version
+    response_cache_max_entries: int = 2_000
+    response_cache_max_age: int = 30
+    # Сколько ответ живёт в кэше воркера даже без смены поколения
+    response_cache_ttl_seconds: float = 60.0
+
     @property
     def db_url(self) -> str:
-        url = self.database_url or self.postgres_connection_string
+        return self._normalize_url(self.database_url or self.postgres_connection_string)
+
+    @property
+    def db_read_url(self) -> str:
+        return self._normalize_url(self.database_read_url)
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
         if url.startswith("postgres://"):
             url = url.replace("postgres://", "postgresql+asyncpg://", 1)
         return url
@@ -18,4 +118,4 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
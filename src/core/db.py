@@ -1,9 +1,46 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
 from src.core.config import settings
 
 
-engine = create_async_engine(settings.db_url, echo=True)
+def build_engine(url: str) -> AsyncEngine:
+    kwargs = dict(
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        kwargs["connect_args"] = {
+            # Кэш prepared statements asyncpg на соединении; 0 — для PgBouncer
+            # в transaction pooling, где серверные prepared statements не живут.
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        }
+    return create_async_engine(url, **kwargs)
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    """Открывает соединения пула заранее, чтобы первые запросы не ждали handshake."""
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+engine = build_engine(settings.db_url)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -11,4 +48,27 @@ SessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
-Base = declarative_base()
\ No newline at end of file
+# Реплика для читающих эндпоинтов; без DATABASE_READ_URL — тот же primary.
+read_engine = build_engine(settings.db_read_url) if settings.db_read_url else engine
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+_primary_reads_until = 0.0
+
+
+def mark_primary_write() -> None:
+    """После записи (синхронизации) чтения какое-то время идут в primary, пока реплика догоняет."""
+    global _primary_reads_until
+    _primary_reads_until = time.monotonic() + settings.read_your_writes_seconds
+
+
+def read_session_factory() -> async_sessionmaker:
+    if read_engine is engine or time.monotonic() < _primary_reads_until:
+        return SessionLocal
+    return ReadSessionLocal
+
+Base = declarative_base()
@@ -1,12 +1,16 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    JSON,
     String,
     DateTime,
+    Float,
     Integer,
     ForeignKey,
     Index,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -48,8 +52,22 @@ class Event(Base):
     __tablename__ = "events"
 
     __table_args__ = (
-        Index("ix_events_event_time", "event_time"),
+        Index("ix_events_event_time_id", "event_time", "id"),
         Index("ix_events_changed_at", "changed_at"),
+        Index("ix_events_status_event_time_id", "status", "event_time", "id"),
+        Index(
+            "ix_events_published_event_time_id",
+            "event_time",
+            "id",
+            postgresql_where=text("status = 'published'"),
+        ),
+        Index("ix_events_place_id", "place_id"),
+        Index(
+            "ix_events_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -98,6 +116,11 @@ class Event(Base):
 class Ticket(Base):
     __tablename__ = "tickets"
 
+    __table_args__ = (
+        Index("ix_tickets_event_id", "event_id"),
+        Index("ix_tickets_ticket_id", "ticket_id", unique=True),
+    )
+
     id: Mapped[str] = mapped_column(String, primary_key=True)
 
     event_id: Mapped[str] = mapped_column(
@@ -106,7 +129,17 @@ class Ticket(Base):
         nullable=False,
     )
 
-    ticket_id: Mapped[str] = mapped_column(String, nullable=False)
+    # id билета у провайдера; пуст, пока асинхронная регистрация не прошла.
+    ticket_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    # "registered", "pending" (ждёт в ticket_outbox), "failed" или "unknown"
+    # (ответ провайдера потерян после отправки — нужна ручная сверка)
+    status: Mapped[str] = mapped_column(
+        String,
+        nullable=False,
+        default="registered",
+        server_default="registered",
+    )
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
 
     first_name: Mapped[str] = mapped_column(String, nullable=False)
     last_name: Mapped[str] = mapped_column(String, nullable=False)
@@ -122,6 +155,34 @@ class Ticket(Base):
     event: Mapped["Event"] = relationship(back_populates="tickets")
 
 
+class TicketOutbox(Base):
+    """Регистрация у провайдера, отложенная до фонового диспетчера.
+
+    Строка вставляется в той же транзакции, что и билет в статусе pending.
+    """
+
+    __tablename__ = "ticket_outbox"
+
+    __table_args__ = (
+        Index("ix_ticket_outbox_next_attempt_at", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ticket_local_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("tickets.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Не раньше этого момента строку можно взять в работу; при захвате
+    # сдвигается вперёд на время аренды.
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    ticket: Mapped["Ticket"] = relationship()
+
+
 class SyncMetadata(Base):
     __tablename__ = "sync_metadata"
 
@@ -136,4 +197,66 @@ class SyncMetadata(Base):
         nullable=True,
     )
 
-    sync_status: Mapped[str | None] = mapped_column(String, nullable=True)
\ No newline at end of file
+    sync_status: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Поколение данных: растёт с каждым закоммиченным батчем синхронизации;
+    # по нему сбрасываются кэши и перечитывается индекс статусов.
+    sync_version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
+    batch_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rows_synced: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rows_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pages_synced: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Сколько строк обещал провайдер (поле count первой страницы), для ETA.
+    rows_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # Чекпоинт незавершённой синхронизации: курсор следующей страницы и
+    # максимальный changed_at среди уже закоммиченных батчей.
+    cursor_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    cursor_changed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+
+class CacheEntry(Base):
+    """Запись общего кэша; UNLOGGED — данные переживать рестарт не обязаны."""
+
+    __tablename__ = "cache_entries"
+
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[object] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+
+class IdempotencyKey(Base):
+    """Ответ на запрос с заголовком Idempotency-Key; пока запрос выполняется — замок."""
+
+    __tablename__ = "idempotency_keys"
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    # Хэш тела запроса: тот же ключ с другим телом — ошибка клиента.
+    fingerprint: Mapped[str] = mapped_column(String, nullable=False)
+    # "in_progress" или "completed"
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    # До какого момента выполняющийся запрос считается живым; потом ключ можно перехватить.
+    locked_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[object | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True,
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class PlaceListResponse(BaseModel):
@@ -36,6 +36,25 @@ class EventListItem(BaseModel):
     number_of_visitors: int
 
 
+def event_list_item_from_row(row: Any) -> dict:
+    """Тот же JSON, что у EventListItem, но из строки EVENT_LIST_COLUMNS без валидации."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "place": {
+            "id": row.place_id,
+            "name": row.place_name,
+            "city": row.place_city,
+            "address": row.place_address,
+            "seats_pattern": row.place_seats_pattern,
+        },
+        "event_time": row.event_time,
+        "registration_deadline": row.registration_deadline,
+        "status": row.status,
+        "number_of_visitors": row.number_of_visitors,
+    }
+
+
 class EventResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -63,4 +82,20 @@ class TicketCreateRequest(BaseModel):
     first_name: str
     last_name: str
     email: EmailStr
-    seat: str
\ No newline at end of file
+    seat: str
+
+
+class TicketBatchItem(BaseModel):
+    first_name: str
+    last_name: str
+    email: EmailStr
+    seat: str
+
+
+class TicketBatchCreateRequest(BaseModel):
+    event_id: str
+    tickets: list[TicketBatchItem] = Field(min_length=1, max_length=100)
+
+
+class TicketBatchCancelRequest(BaseModel):
+    ticket_ids: list[str] = Field(min_length=1, max_length=1000)
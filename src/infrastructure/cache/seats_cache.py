@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import typing
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.domain.models import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(typing.Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryCache:
+    """LRU с TTL и ограничением на число записей; живёт в одном процессе."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class PostgresCache:
+    """Общий для всех воркеров кэш в UNLOGGED-таблице cache_entries."""
+
+    def __init__(self, session_factory: Callable[[], Any]) -> None:
+        self._session_factory = session_factory
+
+    async def get(self, key: str) -> Any | None:
+        async with self._session_factory() as session:
+            return await session.scalar(
+                select(CacheEntry.value).where(
+                    CacheEntry.key == key,
+                    CacheEntry.expires_at > func.now(),
+                )
+            )
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        stmt = insert(CacheEntry).values(
+            key=key,
+            value=value,
+            expires_at=func.now() + timedelta(seconds=ttl),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheEntry.key],
+            set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+        )
+        async with self._session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete(self, key: str) -> None:
+        async with self._session_factory() as session:
+            await session.execute(delete(CacheEntry).where(CacheEntry.key == key))
+            await session.commit()
+
+
+class SingleFlight:
+    """Схлопывает одновременные загрузки одного ключа в один вызов.
+
+    Загрузка идёт в отдельной задаче, а вызывающие ждут её через shield:
+    отмена любого из них (клиент отключился) не отменяет загрузку и не
+    роняет остальных.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Если все ожидающие ушли, исключение никто не заберёт — asyncio ругается в лог.
+        if not task.cancelled():
+            task.exception()
+
+
+class SeatsCache:
+    """Двухуровневый кэш свободных мест: локальный LRU и опциональный общий бэкенд."""
+
+    def __init__(
+        self,
+        local: InMemoryCache,
+        ttl: float,
+        shared: CacheBackend | None = None,
+        local_ttl: float | None = None,
+        stale: InMemoryCache | None = None,
+        stale_ttl: float = 0.0,
+    ) -> None:
+        self._local = local
+        # Последние успешно загруженные значения; отдаются, пока провайдер недоступен.
+        self._stale = stale
+        self._stale_ttl = stale_ttl
+        self._shared = shared
+        self._ttl = ttl
+        # С общим бэкендом локальная копия живёт недолго, чтобы инвалидация
+        # из другого воркера была видна быстро.
+        self._local_ttl = min(ttl, local_ttl) if shared and local_ttl else ttl
+        self._flight = SingleFlight()
+        # Поколение ключа растёт при invalidate: загрузка, начатая до него,
+        # не записывает результат в кэш (в пределах процесса).
+        self._generations: dict[str, int] = {}
+
+    @staticmethod
+    def _key(event_id: str) -> str:
+        return f"seats:{event_id}"
+
+    async def get(self, event_id: str) -> list[str] | None:
+        key = self._key(event_id)
+        value = await self._local.get(key)
+        if value is not None or self._shared is None:
+            return value
+        value = await self._shared_call(self._shared.get, key)
+        if value is not None:
+            await self._local.set(key, value, self._local_ttl)
+        return value
+
+    async def get_or_load(
+        self,
+        event_id: str,
+        loader: Callable[[], Awaitable[list[str]]],
+    ) -> list[str]:
+        value = await self.get(event_id)
+        if value is not None:
+            return value
+        key = self._key(event_id)
+        generation = self._generations.get(key, 0)
+        # Загрузка, начатая до инвалидации, не должна достаться новым запросам.
+        return await self._flight.do(
+            f"{key}#{generation}", lambda: self._load(event_id, loader, generation)
+        )
+
+    async def get_stale(self, event_id: str) -> list[str] | None:
+        if self._stale is None:
+            return None
+        return await self._stale.get(self._key(event_id))
+
+    async def invalidate(self, event_id: str) -> None:
+        key = self._key(event_id)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        await self._local.delete(key)
+        if self._shared is not None:
+            await self._shared_call(self._shared.delete, key)
+
+    async def _load(
+        self,
+        event_id: str,
+        loader: Callable[[], Awaitable[list[str]]],
+        generation: int,
+    ) -> list[str]:
+        key = self._key(event_id)
+        value = await loader()
+        if self._generations.get(key, 0) != generation:
+            # Пока шла загрузка, место продали или освободили — ответ устарел.
+            return value
+        await self._local.set(key, value, self._local_ttl)
+        if self._stale is not None:
+            await self._stale.set(key, value, self._stale_ttl)
+        if self._shared is not None:
+            await self._shared_call(self._shared.set, key, value, self._ttl)
+        return value
+
+    @staticmethod
+    async def _shared_call(fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        # Недоступный общий кэш не должен ронять запрос — работаем на локальном.
+        try:
+            return await fn(*args)
+        except Exception:
+            logger.exception("Shared seats cache call failed")
+            return None
+
+
+_seats_cache: SeatsCache | None = None
+
+
+def get_seats_cache() -> SeatsCache:
+    global _seats_cache
+    if _seats_cache is None:
+        from src.core.config import settings
+        shared: CacheBackend | None = None
+        if settings.seats_cache_backend == "postgres":
+            from src.core.db import SessionLocal
+            shared = PostgresCache(SessionLocal)
+        _seats_cache = SeatsCache(
+            local=InMemoryCache(max_entries=settings.seats_cache_max_entries),
+            ttl=settings.seats_cache_ttl,
+            shared=shared,
+            local_ttl=settings.seats_cache_local_ttl,
+            stale=InMemoryCache(max_entries=settings.seats_cache_max_entries),
+            stale_ttl=settings.seats_cache_stale_ttl,
+        )
+    return _seats_cache
@@ -1,41 +1,166 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import AsyncIterator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Mapping
+from urllib.parse import quote
 
 import httpx
 
+from src.infrastructure.clients.json_stream import iter_array_items
+from src.infrastructure.clients.resilience import (
+    CircuitBreaker,
+    ProviderRejected,
+    ProviderTemporaryError,
+    RetryPolicy,
+    TokenBucket,
+)
+
 logger = logging.getLogger(__name__)
 
+_SERVER_ERRORS = frozenset(range(500, 600))
+# Ответы, после которых идемпотентный запрос имеет смысл повторить: любая
+# 5xx (включая разовую 500 посреди пагинации) и 429.
+RETRYABLE_STATUSES = _SERVER_ERRORS | {429}
+# Ответы на register/unregister, которые означают окончательный отказ.
+REJECTED_STATUSES = frozenset({400, 404, 409, 422})
+
+
+class StreamedPage:
+    """Страница провайдера, строки которой читаются из тела ответа по мере разбора.
+
+    next_url и count известны после того, как rows() прочитан до конца.
+    Ожидание байтов тела суммарно ограничено timeout (время, которое вызывающий
+    тратит на обработку строк, не считается). Обрыв или таймаут посреди тела
+    не повторяется — страница уже частично отдана вызывающему: ошибка
+    засчитывается breaker-у и поднимается наверх, а синхронизация
+    продолжится со своего чекпоинта в следующий запуск.
+    """
+
+    streamed = True
+
+    def __init__(
+        self,
+        url: str,
+        response: httpx.Response,
+        timeout: float | None = None,
+        on_failure: Callable[[], None] | None = None,
+    ) -> None:
+        self.url = url
+        self._response = response
+        self._timeout = timeout
+        self._on_failure = on_failure
+        self._fields: dict = {}
+
+    @property
+    def next_url(self) -> str | None:
+        return self._fields.get("next")
+
+    @property
+    def count(self) -> int | None:
+        return self._fields.get("count")
+
+    def rows(self) -> AsyncIterator[dict]:
+        return iter_array_items(self._chunks(), "results", self._fields)
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        chunks = self._response.aiter_bytes()
+        remaining = self._timeout
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    async with asyncio.timeout(remaining):
+                        chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    return
+                if remaining is not None:
+                    remaining -= time.monotonic() - started
+                yield chunk
+        except (httpx.TransportError, TimeoutError):
+            if self._on_failure is not None:
+                self._on_failure()
+            raise
+
 
 class EventsProviderClient:
 
-    def __init__(self, base_url: str, api_key: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        http_client: httpx.AsyncClient | None = None,
+        timeouts: Mapping[str, float] | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: TokenBucket | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self._base_url = base_url.rstrip("/")
         self._headers = {"x-api-key": api_key}
+        self._http = http_client or httpx.AsyncClient()
+        self._timeouts = dict(timeouts or {})
+        self._retry = retry or RetryPolicy(attempts=1)
+        self._rate_limiter = rate_limiter
+        self._breaker = breaker
 
+    async def aclose(self) -> None:
+        await self._http.aclose()
 
     async def events(self, cursor_url: str | None = None) -> dict:
         url = cursor_url or f"{self._base_url}/api/events/?changed_at=2000-01-01"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._headers, follow_redirects=True)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._call(
+            "events",
+            lambda: self._http.get(url, headers=self._headers, follow_redirects=True),
+            idempotent=True,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def events_since_url(self, changed_at: str) -> str:
+        return f"{self._base_url}/api/events/?changed_at={quote(changed_at)}"
 
     async def events_since(self, changed_at: str) -> dict:
-        url = f"{self._base_url}/api/events/?changed_at={changed_at}"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._headers, follow_redirects=True)
+        url = self.events_since_url(changed_at)
+        resp = await self._call(
+            "events",
+            lambda: self._http.get(url, headers=self._headers, follow_redirects=True),
+            idempotent=True,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    @asynccontextmanager
+    async def stream_events(self, url: str) -> AsyncIterator[StreamedPage]:
+        """Страница событий без чтения тела целиком: строки разбираются из потока."""
+        request = self._http.build_request("GET", url, headers=self._headers)
+        resp = await self._call(
+            "events",
+            lambda: self._http.send(request, stream=True, follow_redirects=True),
+            idempotent=True,
+        )
+        try:
             resp.raise_for_status()
-            return resp.json()
+            yield StreamedPage(
+                str(request.url),
+                resp,
+                timeout=self._timeouts.get("events"),
+                on_failure=lambda: self._record(failed=True),
+            )
+        finally:
+            await resp.aclose()
 
     async def seats(self, event_id: str) -> list[str]:
         url = f"{self._base_url}/api/events/{event_id}/seats/"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._headers, follow_redirects=True)
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("seats", [])
+        resp = await self._call(
+            "seats",
+            lambda: self._http.get(url, headers=self._headers, follow_redirects=True),
+            idempotent=True,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return data.get("seats", [])
 
     async def register(
         self,
@@ -52,34 +177,149 @@ class EventsProviderClient:
             "email": email,
             "seat": seat,
         }
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
+        resp = await self._call(
+            "register",
+            lambda: self._http.post(
                 url, json=payload, headers=self._headers, follow_redirects=False
-            )
-            if resp.status_code not in (200, 201):
-                raise ValueError(f"Register failed: {resp.status_code} {resp.text}")
-            return resp.json()["ticket_id"]
+            ),
+            idempotent=False,
+        )
+        if resp.status_code not in (200, 201):
+            _raise_for_ticket_error("Register", resp)
+        return resp.json()["ticket_id"]
 
     async def unregister(self, event_id: str, ticket_id: str) -> bool:
         """Отменить регистрацию. Возвращает True при успехе."""
         url = f"{self._base_url}/api/events/{event_id}/unregister/"
         payload = {"ticket_id": ticket_id}
-        async with httpx.AsyncClient() as client:
-            resp = await client.request(
+        resp = await self._call(
+            "unregister",
+            lambda: self._http.request(
                 "DELETE",
                 url,
                 json=payload,
                 headers=self._headers,
                 follow_redirects=False,
-            )
-            if resp.status_code != 200:
-                raise ValueError(f"Unregister failed: {resp.status_code} {resp.text}")
-            return resp.json().get("success", False)
+            ),
+            idempotent=False,
+        )
+        if resp.status_code != 200:
+            _raise_for_ticket_error("Unregister", resp)
+        return resp.json().get("success", False)
 
+    async def _call(
+        self,
+        operation: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool,
+    ) -> httpx.Response:
+        """Отправляет запрос с таймаутом, лимитом QPS, повторами и circuit breaker.
 
-def get_events_client() -> EventsProviderClient:
+        Повторяются только идемпотентные запросы: повтор register после
+        таймаута мог бы занять место второй раз.
+        """
+        if self._breaker is not None:
+            self._breaker.before_call()
+        timeout = self._timeouts.get(operation)
+        attempts = self._retry.attempts if idempotent else 1
+
+        attempt = 0
+        while True:
+            last = attempt + 1 >= attempts
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            try:
+                async with asyncio.timeout(timeout):
+                    resp = await send()
+            except (httpx.TransportError, TimeoutError) as exc:
+                if last:
+                    self._record(failed=True)
+                    raise
+                logger.warning("Provider %s failed (%r), retrying", operation, exc)
+            else:
+                if last or resp.status_code not in RETRYABLE_STATUSES:
+                    self._record(failed=resp.status_code in _SERVER_ERRORS)
+                    return resp
+                await resp.aclose()
+                logger.warning("Provider %s returned %s, retrying", operation, resp.status_code)
+            await asyncio.sleep(self._retry.delay(attempt))
+            attempt += 1
+
+    def _record(self, failed: bool) -> None:
+        if self._breaker is None:
+            return
+        if failed:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+
+
+def _raise_for_ticket_error(action: str, resp: httpx.Response) -> None:
+    message = f"{action} failed: {resp.status_code} {resp.text}"
+    if resp.status_code in REJECTED_STATUSES:
+        raise ProviderRejected(message)
+    raise ProviderTemporaryError(message, resp.status_code)
+
+
+_events_client: EventsProviderClient | None = None
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Пул соединений к провайдеру с keep-alive; HTTP/2 требует пакет h2 (httpx[http2])."""
     from src.core.config import settings
-    return EventsProviderClient(
-        base_url=settings.events_api_url,
-        api_key=settings.events_api_key,
-    )
\ No newline at end of file
+    return httpx.AsyncClient(
+        http2=settings.provider_http2,
+        limits=httpx.Limits(
+            max_connections=settings.provider_max_connections,
+            max_keepalive_connections=settings.provider_max_keepalive_connections,
+            keepalive_expiry=settings.provider_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.provider_connect_timeout,
+            read=settings.provider_read_timeout,
+            write=settings.provider_write_timeout,
+            pool=settings.provider_pool_timeout,
+        ),
+    )
+
+
+def init_events_client() -> EventsProviderClient:
+    global _events_client
+    if _events_client is None:
+        from src.core.config import settings
+        rate_limiter = None
+        if settings.provider_max_qps > 0:
+            rate_limiter = TokenBucket(settings.provider_max_qps, settings.provider_burst)
+        _events_client = EventsProviderClient(
+            base_url=settings.events_api_url,
+            api_key=settings.events_api_key,
+            http_client=build_http_client(),
+            timeouts={
+                "events": settings.provider_events_timeout,
+                "seats": settings.provider_seats_timeout,
+                "register": settings.provider_tickets_timeout,
+                "unregister": settings.provider_tickets_timeout,
+            },
+            retry=RetryPolicy(
+                attempts=settings.provider_retry_attempts,
+                base_delay=settings.provider_retry_base_delay,
+                max_delay=settings.provider_retry_max_delay,
+            ),
+            rate_limiter=rate_limiter,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.provider_breaker_failures,
+                reset_timeout=settings.provider_breaker_reset_seconds,
+            ),
+        )
+    return _events_client
+
+
+async def close_events_client() -> None:
+    global _events_client
+    if _events_client is not None:
+        await _events_client.aclose()
+        _events_client = None
+
+
+def get_events_client() -> EventsProviderClient:
+    return init_events_client()
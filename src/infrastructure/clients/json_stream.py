@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterator
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+# Сколько уже разобранного текста держать в буфере, прежде чем отрезать его.
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class _Reader:
+    """Текстовый буфер поверх потока байтов: дочитывает по мере разбора."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.buf += self._utf8.decode(b"", final=True)
+            return True
+        if self.pos > _COMPACT_THRESHOLD:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += self._utf8.decode(chunk)
+        return True
+
+    async def peek(self) -> str:
+        """Первый непробельный символ без его потребления."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not await self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    async def expect(self, chars: str) -> str:
+        char = await self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+            # Число в конце буфера могло оборваться посреди цифр.
+            if end == len(self.buf) and not self.eof and await self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+async def iter_array_items(
+    chunks: AsyncIterator[bytes],
+    array_key: str,
+    fields: dict[str, Any],
+) -> AsyncIterator[Any]:
+    """Разбирает JSON-объект из потока и отдаёт элементы массива array_key по одному.
+
+    Остальные поля верхнего уровня складываются в fields; они заполнены
+    полностью, когда итерация закончилась. Целиком в памяти держится только
+    текущий элемент массива.
+    """
+    reader = _Reader(chunks)
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = await reader.value()
+        await reader.expect(":")
+        if key == array_key and await reader.peek() == "[":
+            reader.pos += 1
+            if await reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield await reader.value()
+                    if await reader.expect(",]") == "]":
+                        break
+        else:
+            fields[key] = await reader.value()
+        if await reader.expect(",}") == "}":
+            return
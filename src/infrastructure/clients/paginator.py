@@ -1,47 +1,119 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import AsyncIterator
 
-from src.infrastructure.clients.events_provider import EventsProviderClient
+from src.infrastructure.clients.events_provider import EventsProviderClient, StreamedPage
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class EventsPage:
+    results: list[dict]
+    next_url: str | None
+    count: int | None = None
+
+    streamed = False
+
+    async def rows(self) -> AsyncIterator[dict]:
+        for row in self.results:
+            yield row
+
+
+_DONE = object()
+
+
 class EventsPaginator:
 
-    def __init__(self, client: EventsProviderClient, changed_at: str = "2000-01-01") -> None:
+    def __init__(
+        self,
+        client: EventsProviderClient,
+        changed_at: str = "2000-01-01",
+        prefetch: int = 0,
+        start_url: str | None = None,
+        stream: bool = False,
+    ) -> None:
         self._client = client
         self._changed_at = changed_at
+        self._prefetch = prefetch
+        self._start_url = start_url
+        self._stream = stream
 
     def __aiter__(self) -> "EventsPaginator":
-        self._next_url: str | None = None
-        self._buffer: list[dict] = []
-        self._started = False
+        self._rows = self._iter_rows()
         return self
 
     async def __anext__(self) -> dict:
-        if self._buffer:
-            return self._buffer.pop(0)
+        return await self._rows.__anext__()
 
-        if self._started and self._next_url is None:
-            raise StopAsyncIteration
+    async def _iter_rows(self) -> AsyncIterator[dict]:
+        async for page in self.iter_pages():
+            async for row in page.rows():
+                yield row
 
-        if not self._started:
-            page = await self._client.events_since(self._changed_at)
-            self._started = True
-        else:
-            page = await self._client.events(cursor_url=self._next_url)
+    async def iter_pages(self) -> AsyncIterator[EventsPage | StreamedPage]:
+        """Страницы по одной; при prefetch > 0 следующие страницы читаются заранее.
 
-        self._next_url = page.get("next")
-        results = page.get("results", [])
+        В режиме stream страницы отдаются как StreamedPage без упреждающего
+        чтения: строки нужно дочитать через rows() до запроса следующей.
+        """
+        if self._stream:
+            async for page in self._stream_pages():
+                yield page
+            return
+        if self._prefetch <= 0:
+            async for page in self._fetch_pages():
+                yield page
+            return
 
-        if not results and self._next_url is None:
-            raise StopAsyncIteration
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._prefetch)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
 
-        self._buffer = list(results)
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        try:
+            async for page in self._fetch_pages():
+                await queue.put(page)
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(_DONE)
 
-        if self._buffer:
-            return self._buffer.pop(0)
+    async def _fetch_pages(self) -> AsyncIterator[EventsPage]:
+        if self._start_url:
+            page = await self._client.events(cursor_url=self._start_url)
+        else:
+            page = await self._client.events_since(self._changed_at)
+        while True:
+            next_url = page.get("next")
+            yield EventsPage(
+                results=page.get("results", []),
+                next_url=next_url,
+                count=page.get("count"),
+            )
+            if next_url is None:
+                return
+            page = await self._client.events(cursor_url=next_url)
 
-        raise StopAsyncIteration
\ No newline at end of file
+    async def _stream_pages(self) -> AsyncIterator[StreamedPage]:
+        url = self._start_url or self._client.events_since_url(self._changed_at)
+        while url:
+            async with self._client.stream_events(url) as page:
+                yield page
+            url = page.next_url
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderUnavailable(Exception):
+    """Circuit breaker открыт: провайдер недавно падал, запрос не отправлялся."""
+
+
+class ProviderRejected(ValueError):
+    """Провайдер отклонил запрос по существу (400/404/409/422): повтор не поможет."""
+
+
+class ProviderTemporaryError(Exception):
+    """Провайдер ответил 429/5xx или иной не окончательной ошибкой: можно повторить позже."""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Ограничение исходящих запросов: rate в секунду, всплеск до burst.
+
+    Токены резервируются сразу (баланс может уйти в минус), поэтому
+    ожидающие корутины выстраиваются в очередь без отдельной блокировки.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = asyncio.sleep,
+    ) -> None:
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self._burst)
+        self._updated = clock()
+
+    async def acquire(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await self._sleep(-self._tokens / self._rate)
+
+
+class CircuitBreaker:
+    """После failure_threshold сбоев подряд отклоняет вызовы на reset_timeout секунд.
+
+    По истечении паузы пропускается одна пробная попытка: успех закрывает
+    breaker, сбой снова открывает его на reset_timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = max(failure_threshold, 1)
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> None:
+        if self._opened_at is None:
+            return
+        now = self._clock()
+        if now - self._opened_at < self._reset_timeout:
+            raise ProviderUnavailable("Events provider circuit is open")
+        # Пробная попытка; следующая — не раньше чем через reset_timeout.
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Events provider circuit closed")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self._threshold:
+            if self._opened_at is None:
+                logger.warning("Events provider circuit opened after %d failures", self._failures)
+            self._opened_at = self._clock()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Повторы идемпотентных запросов: экспоненциальный backoff с full jitter."""
+
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    rng: Callable[[], float] = field(default=random.random, compare=False)
+
+    def delay(self, attempt: int) -> float:
+        return self.rng() * min(self.max_delay, self.base_delay * 2 ** attempt)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Ключи pg_advisory_lock, общие для всех процессов приложения.
+SYNC_LOCK_KEY = 0x53594E43  # "SYNC"
+SCHEDULER_LOCK_KEY = 0x53434844  # "SCHD"
+
+
+@asynccontextmanager
+async def try_advisory_lock(engine: AsyncEngine, key: int) -> AsyncIterator[bool]:
+    """Сессионный advisory lock на отдельном соединении.
+
+    Отдаёт False, если замок уже держит другой процесс. Соединение живёт, пока
+    открыт контекст; при его обрыве PostgreSQL снимает замок сам.
+    """
+    async with engine.connect() as conn:
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(key))))
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(select(func.pg_advisory_unlock(key)))
+                await conn.commit()
@@ -1,14 +1,58 @@
 from __future__ import annotations
 
+import json
 from datetime import date, datetime, time
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from src.domain.models import Event, Place
 
+# Колонки списка событий для быстрого пути без ORM-объектов и identity map.
+EVENT_LIST_COLUMNS = (
+    Event.id,
+    Event.name,
+    Event.event_time,
+    Event.registration_deadline,
+    Event.status,
+    Event.number_of_visitors,
+    Place.id.label("place_id"),
+    Place.name.label("place_name"),
+    Place.city.label("place_city"),
+    Place.address.label("place_address"),
+    Place.seats_pattern.label("place_seats_pattern"),
+)
+
+
+# Событие вместе с площадкой одним JOIN. Конструкция собирается один раз,
+# скомпилированный SQL берётся из кэша SQLAlchemy.
+_GET_BY_ID = (
+    select(Event)
+    .options(joinedload(Event.place, innerjoin=True))
+    .where(Event.id == bindparam("event_id"))
+)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 
 class SqlAlchemyEventRepository:
     def __init__(self, session: AsyncSession) -> None:
@@ -20,12 +64,49 @@ class SqlAlchemyEventRepository:
     async def update(self, event: Event) -> None:
         await self._session.merge(event)
 
-    async def get_by_id(self, event_id: str) -> Event | None:
-        result = await self._session.execute(
-            select(Event)
-            .options(selectinload(Event.place))
-            .where(Event.id == event_id)
+    async def upsert_places(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = insert(Place)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Place.id],
+            set_={
+                "name": stmt.excluded.name,
+                "city": stmt.excluded.city,
+                "address": stmt.excluded.address,
+                "seats_pattern": stmt.excluded.seats_pattern,
+                "changed_at": stmt.excluded.changed_at,
+            },
+            where=Place.changed_at < stmt.excluded.changed_at,
+        )
+        await self._session.execute(stmt, rows)
+
+    async def upsert_events(self, rows: list[dict]) -> int:
+        """Возвращает число событий, которые реально вставлены или обновлены."""
+        if not rows:
+            return 0
+        stmt = insert(Event)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Event.id],
+            set_={
+                "name": stmt.excluded.name,
+                "event_time": stmt.excluded.event_time,
+                "registration_deadline": stmt.excluded.registration_deadline,
+                "status": stmt.excluded.status,
+                "number_of_visitors": stmt.excluded.number_of_visitors,
+                "changed_at": stmt.excluded.changed_at,
+                "status_changed_at": stmt.excluded.status_changed_at,
+                "place_id": stmt.excluded.place_id,
+            },
+            where=Event.changed_at < stmt.excluded.changed_at,
         )
+        # Пропущенные WHERE строки в RETURNING не попадают; rowcount при
+        # executemany драйверы считают по-разному.
+        result = await self._session.execute(stmt.returning(Event.id), rows)
+        return len(result.all())
+
+    async def get_by_id(self, event_id: str) -> Event | None:
+        result = await self._session.execute(_GET_BY_ID, {"event_id": event_id})
         return result.scalars().first()
 
     async def get_by_id_with_place(self, event_id: str) -> Event | None:
@@ -39,28 +120,130 @@ class SqlAlchemyEventRepository:
         date_to: Optional[date] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[int, list[Event]]:
-        query = select(Event).options(selectinload(Event.place))
-        filters = []
+        count_mode: str = "exact",
+        lookahead: int = 0,
+        by_relevance: bool = False,
+        lean: bool = False,
+    ) -> tuple[int | None, list]:
+        """Страница событий и общее количество.
+
+        count_mode: "exact" — точное число отдельным узким COUNT по events,
+        "window" — через count(*) OVER () в том же запросе (один round-trip, но
+        окну приходится прочитать и отсортировать всю выборку с JOIN до LIMIT),
+        "estimate" — оценка планировщика, "none" — без подсчёта. lookahead добавляет
+        к выборке строки после страницы, чтобы понять, есть ли следующая.
+        by_relevance сортирует по триграммной близости названия к name.
+        lean=True возвращает строки EVENT_LIST_COLUMNS вместо ORM-объектов.
+        """
+        filters = self._filters(name, status, date_from, date_to)
+        offset = (page - 1) * page_size
+        order_by = [Event.event_time, Event.id]
+        if by_relevance and name:
+            order_by.insert(0, func.similarity(Event.name, name).desc())
+        query = (
+            self._select_items(lean)
+            .where(*filters)
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(page_size + lookahead)
+        )
+
+        if count_mode != "window":
+            result = await self._session.execute(query)
+            items = list(result.all() if lean else result.scalars().all())
+            total = None
+            if count_mode == "exact":
+                if len(items) < page_size + lookahead and (items or not offset):
+                    # Последняя страница: число известно без COUNT.
+                    total = offset + len(items)
+                else:
+                    total = await self.count(name, status, date_from, date_to)
+            elif count_mode == "estimate":
+                total = await self.estimate_count(name, status, date_from, date_to)
+            return total, items
+
+        result = await self._session.execute(
+            query.add_columns(func.count().over().label("total"))
+        )
+        rows = result.all()
+        if rows:
+            return rows[0].total, rows if lean else [row[0] for row in rows]
+        # За концом выборки окно пустое — точное число нужно посчитать отдельно.
+        total = await self.count(name, status, date_from, date_to) if offset else 0
+        return total, []
+
+    async def list_after(
+        self,
+        after: tuple[datetime, str] | None = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 20,
+        lean: bool = False,
+    ) -> list:
+        """Keyset-пагинация по (event_time, id): стоимость не зависит от глубины страницы."""
+        filters = self._filters(name, status, date_from, date_to)
+        if after is not None:
+            filters.append(tuple_(Event.event_time, Event.id) > tuple_(*after))
+
+        result = await self._session.execute(
+            self._select_items(lean)
+            .where(*filters)
+            .order_by(Event.event_time, Event.id)
+            .limit(limit)
+        )
+        return list(result.all() if lean else result.scalars().all())
+
+    async def count(
+        self,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> int:
+        filters = self._filters(name, status, date_from, date_to)
+        return await self._session.scalar(
+            select(func.count()).select_from(Event).where(*filters)
+        )
+
+    async def estimate_count(
+        self,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> int:
+        """Оценка числа строк по плану запроса, без сканирования таблицы."""
+        filters = self._filters(name, status, date_from, date_to)
+        result = await self._session.execute(
+            _Explain(select(Event.id).where(*filters))
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _select_items(lean: bool) -> Select:
+        if lean:
+            return select(*EVENT_LIST_COLUMNS).join(Place, Event.place_id == Place.id)
+        return select(Event).options(joinedload(Event.place, innerjoin=True))
 
+    @staticmethod
+    def _filters(
+        name: Optional[str],
+        status: Optional[str],
+        date_from: Optional[date],
+        date_to: Optional[date],
+    ) -> list:
+        filters = []
         if name:
-            filters.append(Event.name.ilike(f"%{name}%"))
+            filters.append(Event.name.ilike(f"%{_escape_like(name)}%", escape="\\"))
         if status:
             filters.append(Event.status == status)
         if date_from:
             filters.append(Event.event_time >= datetime.combine(date_from, time.min))
         if date_to:
             filters.append(Event.event_time <= datetime.combine(date_to, time.max))
-
-        if filters:
-            query = query.where(*filters)
-
-        total: int = await self._session.scalar(
-            select(func.count()).select_from(query.subquery())
-        )
-
-        offset = (page - 1) * page_size
-        result = await self._session.execute(query.offset(offset).limit(page_size))
-        items = list(result.scalars().all())
-
-        return total, items
\ No newline at end of file
+        return filters
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.domain.models import TicketOutbox
+
+
+class SqlAlchemyTicketOutboxRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, ticket_local_id: str) -> None:
+        self._session.add(
+            TicketOutbox(
+                ticket_local_id=ticket_local_id,
+                attempts=0,
+                next_attempt_at=datetime.now(timezone.utc),
+            )
+        )
+
+    async def claim(self, limit: int, lease_seconds: float) -> list[TicketOutbox]:
+        """Берёт в работу готовые строки и продлевает их аренду.
+
+        SKIP LOCKED позволяет диспетчерам всех воркеров разбирать очередь
+        параллельно; после коммита строка не видна другим до конца аренды,
+        даже если этот воркер упадёт, не дойдя до результата.
+        """
+        now = datetime.now(timezone.utc)
+        result = await self._session.execute(
+            select(TicketOutbox)
+            .options(joinedload(TicketOutbox.ticket, innerjoin=True))
+            .where(TicketOutbox.next_attempt_at <= now)
+            .order_by(TicketOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=TicketOutbox)
+        )
+        entries = list(result.scalars())
+        if entries:
+            await self._session.execute(
+                update(TicketOutbox)
+                .where(TicketOutbox.id.in_([entry.id for entry in entries]))
+                .values(next_attempt_at=now + timedelta(seconds=lease_seconds))
+            )
+        return entries
+
+    async def delete(self, outbox_id: int) -> None:
+        await self._session.execute(delete(TicketOutbox).where(TicketOutbox.id == outbox_id))
+
+    async def reschedule(self, outbox_id: int, attempts: int, delay: float, error: str) -> None:
+        await self._session.execute(
+            update(TicketOutbox)
+            .where(TicketOutbox.id == outbox_id)
+            .values(
+                attempts=attempts,
+                next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay),
+                last_error=error,
+            )
+        )
@@ -17,4 +17,8 @@ class SyncMetadataRepository:
             meta = SyncMetadata(id=1)
             self._session.add(meta)
             await self._session.flush()
-        return meta
\ No newline at end of file
+        return meta
+
+    async def get(self) -> SyncMetadata | None:
+        result = await self._session.execute(select(SyncMetadata).limit(1))
+        return result.scalars().first()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.models import Ticket
@@ -33,14 +33,68 @@ class SqlAlchemyTicketRepository:
         self._session.add(db_ticket)
         return db_ticket
 
-    async def get_by_local_id(self, local_id: str) -> Ticket | None:
-        result = await self._session.execute(
-            select(Ticket).where(
-            (Ticket.ticket_id == local_id) | (Ticket.id == local_id)
+    async def create_pending(
+        self,
+        event_id: str,
+        first_name: str,
+        last_name: str,
+        email: str,
+        seat: str,
+    ) -> Ticket:
+        """Билет без id провайдера: регистрацию выполнит диспетчер outbox."""
+        db_ticket = Ticket(
+            id=str(uuid4()),
+            event_id=event_id,
+            ticket_id=None,
+            status="pending",
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            seat=seat,
         )
+        self._session.add(db_ticket)
+        return db_ticket
+
+    async def mark_registered(self, local_id: str, ticket_id: str) -> None:
+        await self._session.execute(
+            update(Ticket)
+            .where(Ticket.id == local_id)
+            .values(ticket_id=ticket_id, status="registered", error=None)
+        )
+
+    async def mark_failed(self, local_id: str, error: str, status: str = "failed") -> None:
+        await self._session.execute(
+            update(Ticket).where(Ticket.id == local_id).values(status=status, error=error)
         )
+
+    async def create_many(self, tickets: list[dict]) -> list[str]:
+        """Вставляет все билеты одним INSERT ... VALUES; возвращает локальные id."""
+        rows = [{"id": str(uuid4()), **ticket} for ticket in tickets]
+        await self._session.execute(insert(Ticket).values(rows))
+        return [row["id"] for row in rows]
+
+    async def get_by_local_id(self, local_id: str) -> Ticket | None:
+        # UNION ALL вместо OR: каждая ветка идёт по своему индексу.
+        stmt = union_all(
+            select(Ticket).where(Ticket.ticket_id == local_id),
+            select(Ticket).where(Ticket.id == local_id),
+        ).limit(1)
+        result = await self._session.execute(select(Ticket).from_statement(stmt))
         return result.scalars().first()
 
+    async def get_many_by_local_ids(self, local_ids: list[str]) -> list[Ticket]:
+        """Билеты по id провайдера или локальному id — одним запросом.
+
+        Как и в get_by_local_id, UNION ALL вместо OR: каждая ветка с IN идёт по
+        своему индексу. Билет, найденный обеими ветками, возвращается один раз.
+        """
+        stmt = union_all(
+            select(Ticket).where(Ticket.ticket_id.in_(local_ids)),
+            select(Ticket).where(Ticket.id.in_(local_ids)),
+        )
+        result = await self._session.execute(select(Ticket).from_statement(stmt))
+        return list({ticket.id: ticket for ticket in result.scalars()}.values())
+
     async def get_by_ticket_id(self, ticket_id: str) -> Ticket | None:
         result = await self._session.execute(
             select(Ticket).where(Ticket.ticket_id == ticket_id)
@@ -48,4 +102,7 @@ class SqlAlchemyTicketRepository:
         return result.scalars().first()
 
     async def delete(self, ticket: Ticket) -> None:
-        await self._session.delete(ticket)
\ No newline at end of file
+        await self._session.delete(ticket)
+
+    async def delete_many(self, ids: list[str]) -> None:
+        await self._session.execute(delete(Ticket).where(Ticket.id.in_(ids)))
@@ -4,7 +4,7 @@ from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.db import SessionLocal
+from src.core.db import SessionLocal, read_session_factory
 
 
 async def get_session() -> AsyncSession:
@@ -12,6 +12,11 @@ async def get_session() -> AsyncSession:
         yield session
 
 
+async def get_read_session() -> AsyncSession:
+    async with read_session_factory()() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_session_ctx():
     async with SessionLocal() as session:
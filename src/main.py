@@ -10,36 +10,80 @@ from fastapi.responses import JSONResponse
 
 from src.api.routes.events import router as events_router
 from src.api.routes.sync import router as sync_router
-from src.infrastructure.clients.events_provider import get_events_client
+from src.core.config import settings
+from src.core.db import engine, mark_primary_write, read_engine, warm_up
+from src.infrastructure.clients.events_provider import (
+    close_events_client,
+    init_events_client,
+)
 from src.infrastructure.db.session import get_session_ctx
-from src.services.sync_service import SyncService
+from src.services.event_status_index import get_event_status_index
+from src.services.idempotency import get_idempotency_store
+from src.services.sync_jobs import get_sync_job_runner
+from src.services.sync_scheduler import build_sync_scheduler
+from src.services.ticket_outbox import build_ticket_outbox_dispatcher
 
 logger = logging.getLogger(__name__)
 
-SYNC_INTERVAL_SECONDS = 24 * 60 * 60
+async def _event_status_index_worker() -> None:
+    index = get_event_status_index()
+    while True:
+        try:
+            version = index.version
+            async with get_session_ctx() as session:
+                await index.refresh(session)
+            if version is not None and index.version != version:
+                # Синхронизацию закоммитил другой воркер — реплика может отставать.
+                mark_primary_write()
+        except Exception:
+            logger.exception("Event status index refresh error")
+        await asyncio.sleep(settings.event_status_index_poll_seconds)
 
 
-async def _background_sync_worker() -> None:
+async def _idempotency_cleanup_worker() -> None:
+    store = get_idempotency_store()
     while True:
+        await asyncio.sleep(settings.idempotency_cleanup_interval_seconds)
         try:
-            async with get_session_ctx() as session:
-                client = get_events_client()
-                service = SyncService(client=client, session=session)
-                await service.run()
+            purged = await store.purge_expired()
+            if purged:
+                logger.info("Purged %d expired idempotency keys", purged)
         except Exception:
-            logger.exception("Background sync error")
-        await asyncio.sleep(SYNC_INTERVAL_SECONDS)
+            logger.exception("Idempotency key cleanup error")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    task = asyncio.create_task(_background_sync_worker())
+    init_events_client()
+    if settings.db_warmup_connections > 0:
+        connections = min(settings.db_warmup_connections, settings.db_pool_size)
+        try:
+            await warm_up(engine, connections)
+            if read_engine is not engine:
+                await warm_up(read_engine, connections)
+        except Exception:
+            logger.exception("Database pool warm-up failed")
+    tasks = [
+        asyncio.create_task(_event_status_index_worker()),
+        asyncio.create_task(build_sync_scheduler().run()),
+        asyncio.create_task(_idempotency_cleanup_worker()),
+        asyncio.create_task(
+            build_ticket_outbox_dispatcher().run(settings.tickets_outbox_poll_seconds)
+        ),
+    ]
     yield
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await get_sync_job_runner().shutdown()
+    await close_events_client()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
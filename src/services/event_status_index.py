@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.domain.models import Event, SyncMetadata
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EventStatus:
+    status: str
+    registration_deadline: datetime
+
+
+class EventStatusIndex:
+    """Статусы событий в памяти процесса.
+
+    События меняются только синхронизацией, поэтому индекс перечитывается,
+    когда растёт sync_version в sync_metadata (с каждым закоммиченным батчем,
+    в том числе незавершённой синхронизации); в остальное время проверки
+    статуса обходятся без запросов в БД.
+
+    Синхронизация перечитывает окно перекрытия водяного знака, поэтому
+    поздняя правка может прийти с changed_at ниже уже виденного максимума:
+    дочитка берёт строки начиная с максимума минус то же окно.
+    """
+
+    def __init__(self, overlap_seconds: float = 0) -> None:
+        self._overlap = timedelta(seconds=overlap_seconds)
+        self._statuses: dict[str, EventStatus] = {}
+        self._version: int | None = None
+        self._max_changed_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    @property
+    def version(self) -> int | None:
+        return self._version
+
+    def get(self, event_id: str) -> EventStatus | None:
+        return self._statuses.get(event_id)
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Дочитывает изменённые события, если sync_version сдвинулась."""
+        async with self._lock:
+            version = await session.scalar(select(SyncMetadata.sync_version).limit(1)) or 0
+            if version == self._version:
+                return
+
+            query = select(Event.id, Event.status, Event.registration_deadline, Event.changed_at)
+            if self._max_changed_at is not None:
+                query = query.where(Event.changed_at >= self._max_changed_at - self._overlap)
+            result = await session.execute(query)
+
+            loaded = 0
+            for event_id, status, deadline, changed_at in result:
+                self._statuses[event_id] = EventStatus(status, deadline)
+                if self._max_changed_at is None or changed_at > self._max_changed_at:
+                    self._max_changed_at = changed_at
+                loaded += 1
+
+            self._version = version
+            logger.info("Event status index at version %d (%d rows loaded)", version, loaded)
+
+
+_event_status_index = EventStatusIndex(
+    overlap_seconds=settings.sync_watermark_overlap_seconds
+)
+
+
+def get_event_status_index() -> EventStatusIndex:
+    return _event_status_index
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+import orjson
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from src.domain.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyKeyMismatch(Exception):
+    """Ключ уже использован для запроса с другим телом."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """Запрос с этим ключом ещё выполняется и не завершился за время ожидания."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+def fingerprint(payload: Any) -> str:
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class IdempotencyStore:
+    """Ключи идемпотентности в таблице idempotency_keys.
+
+    Первый запрос с ключом вставляет строку-замок и выполняется; повторы ждут,
+    пока он завершится, и получают сохранённый ответ. Замок с истёкшим
+    locked_until (упавший воркер) перехватывается следующим повтором.
+    Каждая операция идёт в своей короткой сессии — соединение не держится,
+    пока запрос ходит к провайдеру.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        ttl: float,
+        lock_timeout: float,
+        wait_timeout: float,
+        poll_interval: float = 0.1,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+
+    async def begin(self, key: str, request_fingerprint: str) -> StoredResponse | None:
+        """None — ключ захвачен, запрос нужно выполнить; иначе готовый ответ."""
+        if await self._try_insert(key, request_fingerprint):
+            return None
+
+        deadline = time.monotonic() + self._wait_timeout
+        while True:
+            async with self._session_factory() as session:
+                row = await session.get(IdempotencyKey, key)
+            if row is None:
+                # Предыдущая попытка упала и сняла замок — пробуем сами.
+                if await self._try_insert(key, request_fingerprint):
+                    return None
+                continue
+            if row.fingerprint != request_fingerprint:
+                raise IdempotencyKeyMismatch(key)
+            if row.status == "completed":
+                return StoredResponse(row.response_status, row.response_body)
+            if await self._try_take_over(key):
+                logger.warning("Idempotency key %s taken over after lock expiry", key)
+                return None
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress(key)
+            await asyncio.sleep(self._poll_interval)
+
+    async def complete(self, key: str, status_code: int, body: Any) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    status="completed",
+                    response_status=status_code,
+                    response_body=body,
+                    expires_at=_now() + timedelta(seconds=self._ttl),
+                )
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        """Снимает замок без ответа: следующий повтор выполнит запрос заново."""
+        async with self._session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status == "in_progress",
+                )
+            )
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at < _now())
+            )
+            await session.commit()
+        return result.rowcount or 0
+
+    async def _try_insert(self, key: str, request_fingerprint: str) -> bool:
+        now = _now()
+        async with self._session_factory() as session:
+            session.add(
+                IdempotencyKey(
+                    key=key,
+                    fingerprint=request_fingerprint,
+                    status="in_progress",
+                    locked_until=now + timedelta(seconds=self._lock_timeout),
+                    expires_at=now + timedelta(seconds=self._ttl),
+                )
+            )
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                return False
+        return True
+
+    async def _try_take_over(self, key: str) -> bool:
+        now = _now()
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status == "in_progress",
+                    IdempotencyKey.locked_until < now,
+                )
+                .values(locked_until=now + timedelta(seconds=self._lock_timeout))
+            )
+            await session.commit()
+        return result.rowcount == 1
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+_idempotency_store: IdempotencyStore | None = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _idempotency_store
+    if _idempotency_store is None:
+        from src.core.config import settings
+        from src.core.db import SessionLocal
+        _idempotency_store = IdempotencyStore(
+            SessionLocal,
+            ttl=settings.idempotency_ttl_seconds,
+            lock_timeout=settings.idempotency_lock_seconds,
+            wait_timeout=settings.idempotency_wait_seconds,
+        )
+    return _idempotency_store
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.core.db import engine
+from src.infrastructure.clients.events_provider import get_events_client
+from src.infrastructure.db.advisory_lock import SYNC_LOCK_KEY, try_advisory_lock
+from src.infrastructure.db.session import get_session_ctx
+from src.services.event_status_index import get_event_status_index
+from src.services.sync_service import SyncService
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_JOBS = 50
+
+
+class SyncAlreadyRunning(Exception):
+    pass
+
+
+async def run_sync_once() -> int:
+    """Одна синхронизация под advisory lock — не больше одной на весь кластер.
+
+    Возвращает число событий, которые она реально вставила или обновила.
+    """
+    async with try_advisory_lock(engine, SYNC_LOCK_KEY) as acquired:
+        if not acquired:
+            raise SyncAlreadyRunning()
+        async with get_session_ctx() as session:
+            service = SyncService(
+                client=get_events_client(),
+                session=session,
+                status_index=get_event_status_index(),
+            )
+            return await service.run()
+
+
+@dataclass
+class SyncJob:
+    id: str
+    status: str = "running"
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    error: str | None = None
+
+
+class SyncJobRunner:
+    """Запускает ручные синхронизации фоном и помнит последние задания процесса."""
+
+    def __init__(self) -> None:
+        self._jobs: OrderedDict[str, SyncJob] = OrderedDict()
+        self._active: tuple[SyncJob, asyncio.Task] | None = None
+
+    def start(self) -> SyncJob:
+        if self._active is not None and not self._active[1].done():
+            return self._active[0]
+
+        job = SyncJob(id=str(uuid4()))
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_TRACKED_JOBS:
+            self._jobs.popitem(last=False)
+        self._active = (job, asyncio.create_task(self._run(job)))
+        return job
+
+    def get(self, job_id: str) -> SyncJob | None:
+        return self._jobs.get(job_id)
+
+    async def shutdown(self) -> None:
+        if self._active is None:
+            return
+        task = self._active[1]
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, job: SyncJob) -> None:
+        try:
+            await run_sync_once()
+            job.status = "success"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except SyncAlreadyRunning:
+            job.status = "skipped"
+            job.error = "Another sync is already running"
+        except Exception as exc:
+            logger.exception("Manual sync %s failed", job.id)
+            job.status = "error"
+            job.error = str(exc)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+
+_sync_job_runner = SyncJobRunner()
+
+
+def get_sync_job_runner() -> SyncJobRunner:
+    return _sync_job_runner
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import AsyncContextManager, Awaitable, Callable
+
+from src.services.sync_jobs import SyncAlreadyRunning
+
+logger = logging.getLogger(__name__)
+
+
+class SyncScheduler:
+    """Периодическая синхронизация с адаптивным интервалом.
+
+    Планировщик запущен в каждом воркере, но синхронизирует только лидер —
+    процесс, который удерживает замок лидерства. Остальные периодически
+    пробуют его взять и подхватывают работу, если лидер пропал.
+
+    Интервал выбирается по числу событий, которые прошлая синхронизация
+    реально вставила или обновила (повторно полученные строки не в счёт):
+    при busy_changes и больше — min_interval, без изменений — max_interval,
+    между ними — геометрически. Сокращается интервал сразу,
+    а растёт не больше чем вдвое за раз. Ошибки дают экспоненциальный
+    backoff от failure_backoff.
+    """
+
+    def __init__(
+        self,
+        run_sync: Callable[[], Awaitable[int]],
+        leadership: Callable[[], AsyncContextManager[bool]],
+        min_interval: float,
+        max_interval: float,
+        busy_changes: int,
+        failure_backoff: float,
+        jitter: float = 0.1,
+        leader_retry: float = 60.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._run_sync = run_sync
+        self._leadership = leadership
+        self._min_interval = min_interval
+        self._max_interval = max(max_interval, min_interval)
+        self._busy_changes = max(busy_changes, 1)
+        self._failure_backoff = failure_backoff
+        self._jitter = jitter
+        self._leader_retry = leader_retry
+        self._sleep = sleep
+        self._rng = rng
+        self._interval = min_interval
+        self._failures = 0
+
+    def next_interval(self, changes: int) -> float:
+        share = min(changes, self._busy_changes) / self._busy_changes
+        target = self._max_interval * (self._min_interval / self._max_interval) ** share
+        if target > self._interval:
+            target = min(target, self._interval * 2)
+        self._interval = target
+        return target
+
+    def failure_delay(self) -> float:
+        self._failures += 1
+        delay = self._failure_backoff * 2 ** (self._failures - 1)
+        return min(delay, self._max_interval)
+
+    def _jittered(self, delay: float) -> float:
+        # Разносим воркеры и повторы после общей аварии провайдера во времени.
+        return delay * (1 + self._jitter * (2 * self._rng() - 1))
+
+    async def tick(self) -> float:
+        """Одна синхронизация; возвращает паузу до следующей."""
+        try:
+            changes = await self._run_sync()
+        except SyncAlreadyRunning:
+            logger.info("Scheduled sync skipped: a manual sync is running")
+            return self._jittered(self._min_interval)
+        except Exception:
+            delay = self.failure_delay()
+            logger.exception("Scheduled sync failed, retrying in %.0f s", delay)
+            return self._jittered(delay)
+        self._failures = 0
+        delay = self.next_interval(changes)
+        logger.info("Scheduled sync saw %d changes, next run in %.0f s", changes, delay)
+        return self._jittered(delay)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with self._leadership() as leader:
+                    if leader:
+                        logger.info("Sync scheduler: this worker is the leader")
+                        while True:
+                            await self._sleep(await self.tick())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Sync scheduler leadership lost")
+            await self._sleep(self._jittered(self._leader_retry))
+
+
+def build_sync_scheduler() -> SyncScheduler:
+    from src.core.config import settings
+    from src.core.db import engine
+    from src.infrastructure.db.advisory_lock import SCHEDULER_LOCK_KEY, try_advisory_lock
+    from src.services.sync_jobs import run_sync_once
+
+    return SyncScheduler(
+        run_sync=run_sync_once,
+        leadership=lambda: try_advisory_lock(engine, SCHEDULER_LOCK_KEY),
+        min_interval=settings.sync_min_interval_seconds,
+        max_interval=settings.sync_max_interval_seconds,
+        busy_changes=settings.sync_busy_changes,
+        failure_backoff=settings.sync_failure_backoff_seconds,
+        jitter=settings.sync_jitter,
+        leader_retry=settings.sync_leader_retry_seconds,
+    )
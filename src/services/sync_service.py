@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.models import Event, Place, SyncMetadata
+from src.core.config import settings
+from src.core.db import mark_primary_write
+from src.domain.models import SyncMetadata
 from src.infrastructure.clients.events_provider import EventsProviderClient
 from src.infrastructure.clients.paginator import EventsPaginator
 from src.infrastructure.db.repositories.event_repository import SqlAlchemyEventRepository
 from src.infrastructure.db.repositories.sync_repository import SyncMetadataRepository
+from src.services.event_status_index import EventStatusIndex
 
 logger = logging.getLogger(__name__)
 
@@ -20,64 +24,121 @@ class SyncService:
         self,
         client: EventsProviderClient,
         session: AsyncSession,
+        batch_size: int | None = None,
+        prefetch: int | None = None,
+        status_index: EventStatusIndex | None = None,
+        stream: bool | None = None,
     ) -> None:
         self._client = client
         self._session = session
+        self._batch_size = batch_size or settings.sync_batch_size
+        self._prefetch = settings.sync_prefetch_pages if prefetch is None else prefetch
+        self._stream = settings.sync_stream_pages if stream is None else stream
+        self._overlap_seconds = settings.sync_watermark_overlap_seconds
+        self._status_index = status_index
         self._event_repo = SqlAlchemyEventRepository(session)
         self._sync_repo = SyncMetadataRepository(session)
+        self._resumed_rows = 0
 
-    async def run(self) -> None:
+    async def run(self) -> int:
+        """Синхронизирует события; возвращает число реально вставленных или обновлённых.
+
+        Строки, которые провайдер отдал повторно (перекрытие водяного знака,
+        перечитанная после resume страница), в это число не входят.
+        """
         logger.info("Starting sync...")
         meta = await self._sync_repo.get_or_create()
 
         if meta.last_changed_at:
-            changed_at_str = meta.last_changed_at.strftime("%Y-%m-%d")
+            # Строки окна перекрытия на клиенте не отбрасываются: среди них
+            # бывают поздно закоммиченные у провайдера, с changed_at меньше
+            # водяного знака. Повторы отсекает WHERE в upsert.
+            since = meta.last_changed_at - timedelta(seconds=self._overlap_seconds)
+            changed_at_str = since.isoformat()
         else:
             changed_at_str = "2000-01-01"
 
+        resume_url = meta.cursor_url
+        if resume_url:
+            logger.info("Resuming sync from checkpoint %s", resume_url)
+
         meta.sync_status = "running"
         meta.last_sync_time = datetime.now(timezone.utc)
+        meta.batch_size = self._batch_size
+        meta.rows_per_second = None
+        if resume_url:
+            # Продолжаем с чекпоинта: счётчики прогресса тоже продолжаются.
+            rows_synced = meta.rows_synced or 0
+            pages_synced = meta.pages_synced or 0
+        else:
+            rows_synced = pages_synced = 0
+            meta.rows_total = None
+        meta.rows_synced = rows_synced
+        meta.pages_synced = pages_synced
+        # Скорость считается только по строкам этого запуска: строки прошлой
+        # попытки записаны до started и завысили бы rows_per_second и ETA.
+        self._resumed_rows = rows_synced
         await self._session.commit()
 
-        max_changed_at: datetime | None = None
+        watermark: datetime | None = None
+        if resume_url and meta.cursor_changed_at:
+            watermark = meta.cursor_changed_at
+        batch: list[dict] = []
+        rows_changed = 0
+        started = time.monotonic()
 
         try:
-            async for raw_event in EventsPaginator(self._client, changed_at=changed_at_str):
-                event, place = self._parse_event(raw_event)
-
-                existing_place = await self._session.get(Place, place.id)
-                if existing_place is None:
-                    self._session.add(place)
-                else:
-                    existing_place.name = place.name
-                    existing_place.city = place.city
-                    existing_place.address = place.address
-                    existing_place.seats_pattern = place.seats_pattern
-                    existing_place.changed_at = place.changed_at
-                await self._session.flush()
-
-                existing_event = await self._session.get(Event, event.id)
-                if existing_event is None:
-                    self._session.add(event)
-                else:
-                    existing_event.name = event.name
-                    existing_event.event_time = event.event_time
-                    existing_event.registration_deadline = event.registration_deadline
-                    existing_event.status = event.status
-                    existing_event.number_of_visitors = event.number_of_visitors
-                    existing_event.changed_at = event.changed_at
-                    existing_event.status_changed_at = event.status_changed_at
-                    existing_event.place_id = event.place_id
-                await self._session.flush()
-
-                if max_changed_at is None or event.changed_at > max_changed_at:
-                    max_changed_at = event.changed_at
+            paginator = EventsPaginator(
+                self._client,
+                changed_at=changed_at_str,
+                prefetch=self._prefetch,
+                start_url=resume_url,
+                stream=self._stream,
+            )
+            async for page in paginator.iter_pages():
+                page_rows = 0
+                async for raw in page.rows():
+                    batch.append(raw)
+                    page_rows += 1
+                    if page.streamed and len(batch) >= self._batch_size:
+                        # Страница дочитана не до конца: при падении её
+                        # перечитаем целиком, upsert это переживёт. Строки
+                        # страницы попадут в rows_synced, только когда она
+                        # дочитана, иначе после resume они посчитались бы дважды.
+                        watermark, changed = await self._flush(meta, batch, watermark)
+                        rows_changed += changed
+                        batch = []
+                        await self._checkpoint(
+                            meta, page.url, watermark, pages_synced, rows_synced, started
+                        )
+                pages_synced += 1
+                rows_synced += page_rows
+                if meta.rows_total is None and page.count is not None:
+                    meta.rows_total = page.count
+                if len(batch) < self._batch_size and page.next_url is not None:
+                    continue
+                if batch:
+                    watermark, changed = await self._flush(meta, batch, watermark)
+                    rows_changed += changed
+                    batch = []
+                # Курсор указывает на первую страницу, ещё не попавшую в БД.
+                await self._checkpoint(
+                    meta, page.next_url, watermark, pages_synced, rows_synced, started
+                )
 
             meta.sync_status = "success"
-            if max_changed_at:
-                meta.last_changed_at = max_changed_at
+            meta.cursor_url = None
+            meta.cursor_changed_at = None
+            if watermark and (meta.last_changed_at is None or watermark > meta.last_changed_at):
+                meta.last_changed_at = watermark
             await self._session.commit()
-            logger.info("Sync completed successfully.")
+            mark_primary_write()
+            logger.info(
+                "Sync completed successfully: %d rows, %d changed, %.1f rows/sec.",
+                rows_synced,
+                rows_changed,
+                meta.rows_per_second or 0.0,
+            )
 
         except Exception as exc:
             await self._session.rollback()
@@ -86,28 +147,93 @@ class SyncService:
             logger.exception("Sync failed: %s", exc)
             raise
 
+        if self._status_index is not None:
+            try:
+                await self._status_index.refresh(self._session)
+            except Exception:
+                logger.exception("Failed to refresh event status index after sync")
+
+        return rows_changed
+
+    async def _flush(
+        self,
+        meta: SyncMetadata,
+        batch: list[dict],
+        watermark: datetime | None,
+    ) -> tuple[datetime, int]:
+        batch_max, changed = await self._write_batch(batch)
+        # Поколение данных растёт с каждым батчем, а не с успехом всей
+        # синхронизации: изменения долгой или упавшей синхронизации уже в БД,
+        # и индекс статусов с кэшем ответов должны их увидеть.
+        meta.sync_version = (meta.sync_version or 0) + 1
+        if watermark is None or batch_max > watermark:
+            return batch_max, changed
+        return watermark, changed
+
+    async def _checkpoint(
+        self,
+        meta: SyncMetadata,
+        cursor_url: str | None,
+        watermark: datetime | None,
+        pages_synced: int,
+        rows_synced: int,
+        started: float,
+    ) -> None:
+        meta.cursor_url = cursor_url
+        if watermark:
+            meta.cursor_changed_at = watermark
+        meta.pages_synced = pages_synced
+        self._record_progress(meta, rows_synced, self._resumed_rows, started)
+        await self._session.commit()
+
+    async def _write_batch(self, raw_events: list[dict]) -> tuple[datetime, int]:
+        """Записывает батч; строки, чей changed_at не вырос, БД пропускает без UPDATE.
+
+        Возвращает максимальный changed_at батча и число изменённых событий.
+        """
+        places: dict[str, dict] = {}
+        events: dict[str, dict] = {}
+        for raw in raw_events:
+            event, place = self._parse_event(raw)
+            places[place["id"]] = place
+            current = events.get(event["id"])
+            if current is None or event["changed_at"] >= current["changed_at"]:
+                events[event["id"]] = event
+
+        await self._event_repo.upsert_places(list(places.values()))
+        changed = await self._event_repo.upsert_events(list(events.values()))
+        return max(e["changed_at"] for e in events.values()), changed
+
+    @staticmethod
+    def _record_progress(
+        meta: SyncMetadata, rows_synced: int, resumed_rows: int, started: float
+    ) -> None:
+        elapsed = time.monotonic() - started
+        meta.rows_synced = rows_synced
+        meta.rows_per_second = (rows_synced - resumed_rows) / elapsed if elapsed > 0 else None
+
     @staticmethod
-    def _parse_event(raw: dict) -> tuple[Event, Place]:
+    def _parse_event(raw: dict) -> tuple[dict, dict]:
         raw_place = raw["place"]
-        place = Place(
-            id=raw_place["id"],
-            name=raw_place["name"],
-            city=raw_place["city"],
-            address=raw_place["address"],
-            seats_pattern=raw_place["seats_pattern"],
-            changed_at=datetime.fromisoformat(raw_place["changed_at"]),
-            created_at=datetime.fromisoformat(raw_place["created_at"]),
-        )
-        event = Event(
-            id=raw["id"],
-            name=raw["name"],
-            event_time=datetime.fromisoformat(raw["event_time"]),
-            registration_deadline=datetime.fromisoformat(raw["registration_deadline"]),
-            status=raw["status"],
-            number_of_visitors=raw["number_of_visitors"],
-            changed_at=datetime.fromisoformat(raw["changed_at"]),
-            created_at=datetime.fromisoformat(raw["created_at"]),
-            status_changed_at=datetime.fromisoformat(raw["status_changed_at"]),
-            place_id=raw_place["id"],
-        )
-        return event, place
\ No newline at end of file
+        place = {
+            "id": raw_place["id"],
+            "name": raw_place["name"],
+            "city": raw_place["city"],
+            "address": raw_place["address"],
+            "seats_pattern": raw_place["seats_pattern"],
+            "changed_at": datetime.fromisoformat(raw_place["changed_at"]),
+            "created_at": datetime.fromisoformat(raw_place["created_at"]),
+        }
+        event = {
+            "id": raw["id"],
+            "name": raw["name"],
+            "event_time": datetime.fromisoformat(raw["event_time"]),
+            "registration_deadline": datetime.fromisoformat(raw["registration_deadline"]),
+            "status": raw["status"],
+            "number_of_visitors": raw["number_of_visitors"],
+            "changed_at": datetime.fromisoformat(raw["changed_at"]),
+            "created_at": datetime.fromisoformat(raw["created_at"]),
+            "status_changed_at": datetime.fromisoformat(raw["status_changed_at"]),
+            "place_id": raw_place["id"],
+        }
+        return event, place
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from src.domain.models import TicketOutbox
+from src.infrastructure.clients.events_provider import EventsProviderClient
+from src.infrastructure.clients.resilience import (
+    ProviderRejected,
+    ProviderTemporaryError,
+    ProviderUnavailable,
+)
+from src.infrastructure.db.repositories.outbox_repository import SqlAlchemyTicketOutboxRepository
+from src.infrastructure.db.repositories.ticket_repository import SqlAlchemyTicketRepository
+
+logger = logging.getLogger(__name__)
+
+# После этих ошибок известно, что регистрация не состоялась: повтор безопасен.
+# Остальные (таймаут или обрыв после отправки, нечитаемый ответ) означают, что
+# место у провайдера могло быть занято, — повтор займёт второе или получит
+# отказ «место занято», поэтому такие билеты не перерегистрируются.
+_RETRYABLE_ERRORS = (
+    ProviderUnavailable,
+    ProviderTemporaryError,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+class TicketOutboxDispatcher:
+    """Разбирает ticket_outbox: регистрирует билеты у провайдера пачками.
+
+    Раунд — до batch_size записей, которые разбирают concurrency исполнителей.
+    Исполнитель берёт запись короткой транзакцией только когда свободен, так
+    что аренда отсчитывается от самого вызова провайдера, а не от ожидания в
+    очереди раунда; результат каждой записи пишется своей транзакцией.
+    Отказ провайдера по существу (ProviderRejected, 4xx) окончателен — билет
+    становится failed; 429/5xx и прочие ошибки повторяются с экспоненциальной
+    паузой до max_attempts. Открытый breaker (ProviderUnavailable) попыткой не
+    считается. Если запрос мог дойти до провайдера, но ответа нет, билет
+    становится unknown и ждёт сверки — повторная регистрация оставила бы
+    за ним второе место или осиротила первое.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        client: EventsProviderClient,
+        batch_size: int,
+        concurrency: int,
+        lease_seconds: float,
+        retry_backoff: float,
+        max_attempts: int,
+        on_registered: Callable[[str], Awaitable[None]] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._client = client
+        self._batch_size = batch_size
+        self._concurrency = max(concurrency, 1)
+        self._lease_seconds = lease_seconds
+        self._retry_backoff = retry_backoff
+        self._max_attempts = max_attempts
+        self._on_registered = on_registered
+
+    async def drain_once(self) -> int:
+        """Обрабатывает один раунд; возвращает число взятых записей."""
+        claimed = 0
+
+        async def worker() -> None:
+            nonlocal claimed
+            while claimed < self._batch_size:
+                claimed += 1
+                entry = await self._claim_one()
+                if entry is None:
+                    claimed -= 1
+                    return
+                await self._dispatch(entry)
+
+        await asyncio.gather(*(worker() for _ in range(self._concurrency)))
+        return claimed
+
+    async def _claim_one(self) -> TicketOutbox | None:
+        async with self._session_factory() as session:
+            entries = await SqlAlchemyTicketOutboxRepository(session).claim(
+                1, self._lease_seconds
+            )
+            await session.commit()
+        return entries[0] if entries else None
+
+    async def run(self, poll_interval: float) -> None:
+        while True:
+            try:
+                drained = await self.drain_once()
+            except Exception:
+                logger.exception("Ticket outbox dispatch error")
+                drained = 0
+            # Полная пачка — вероятно, в очереди есть ещё: берём сразу.
+            if drained < self._batch_size:
+                await asyncio.sleep(poll_interval)
+
+    async def _dispatch(self, entry: TicketOutbox) -> None:
+        ticket = entry.ticket
+        try:
+            ticket_id = await self._client.register(
+                event_id=ticket.event_id,
+                first_name=ticket.first_name,
+                last_name=ticket.last_name,
+                email=ticket.email,
+                seat=ticket.seat,
+            )
+        except ProviderRejected as exc:
+            logger.warning("Provider rejected outbox ticket %s: %s", ticket.id, exc)
+            await self._finish(entry, error=str(exc))
+            return
+        except _RETRYABLE_ERRORS as exc:
+            await self._retry(entry, exc)
+            return
+        except Exception as exc:
+            logger.error(
+                "Outbox ticket %s outcome unknown, needs reconciliation: %r", ticket.id, exc
+            )
+            await self._finish(entry, error=str(exc) or type(exc).__name__, status="unknown")
+            return
+        await self._finish(entry, ticket_id=ticket_id)
+        if self._on_registered is not None:
+            try:
+                await self._on_registered(ticket.event_id)
+            except Exception:
+                logger.exception("Post-registration hook failed for ticket %s", ticket.id)
+
+    async def _finish(
+        self,
+        entry: TicketOutbox,
+        ticket_id: str | None = None,
+        error: str | None = None,
+        status: str = "failed",
+    ) -> None:
+        async with self._session_factory() as session:
+            tickets = SqlAlchemyTicketRepository(session)
+            if ticket_id is not None:
+                await tickets.mark_registered(entry.ticket_local_id, ticket_id)
+            else:
+                await tickets.mark_failed(
+                    entry.ticket_local_id, error or "Registration failed", status
+                )
+            await SqlAlchemyTicketOutboxRepository(session).delete(entry.id)
+            await session.commit()
+
+    async def _retry(self, entry: TicketOutbox, exc: Exception) -> None:
+        error = str(exc) or type(exc).__name__
+        if isinstance(exc, ProviderUnavailable):
+            # Breaker открыт — до провайдера запрос не дошёл, попытку не считаем.
+            await self._reschedule(entry, entry.attempts, self._retry_backoff, error)
+            return
+        attempts = entry.attempts + 1
+        if attempts >= self._max_attempts:
+            logger.error(
+                "Outbox ticket %s failed after %d attempts: %s",
+                entry.ticket_local_id,
+                attempts,
+                error,
+            )
+            await self._finish(entry, error=error)
+            return
+        delay = self._retry_backoff * 2 ** (attempts - 1)
+        logger.warning(
+            "Outbox ticket %s attempt %d failed (%s), retrying in %.0f s",
+            entry.ticket_local_id,
+            attempts,
+            error,
+            delay,
+        )
+        await self._reschedule(entry, attempts, delay, error)
+
+    async def _reschedule(
+        self, entry: TicketOutbox, attempts: int, delay: float, error: str
+    ) -> None:
+        async with self._session_factory() as session:
+            await SqlAlchemyTicketOutboxRepository(session).reschedule(
+                entry.id, attempts, delay, error
+            )
+            await session.commit()
+
+
+def build_ticket_outbox_dispatcher() -> TicketOutboxDispatcher:
+    from src.core.config import settings
+    from src.core.db import SessionLocal
+    from src.infrastructure.cache.seats_cache import get_seats_cache
+    from src.infrastructure.clients.events_provider import get_events_client
+
+    return TicketOutboxDispatcher(
+        SessionLocal,
+        client=get_events_client(),
+        batch_size=settings.tickets_outbox_batch_size,
+        concurrency=settings.tickets_outbox_concurrency,
+        lease_seconds=settings.tickets_outbox_lease_seconds,
+        retry_backoff=settings.tickets_outbox_retry_seconds,
+        max_attempts=settings.tickets_outbox_max_attempts,
+        on_registered=get_seats_cache().invalidate,
+    )
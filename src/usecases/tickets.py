@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import typing
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
 
 class EventsProviderClientProtocol(typing.Protocol):
     async def register(
@@ -16,6 +21,18 @@ class EventRepositoryProtocol(typing.Protocol):
     async def get_by_id(self, event_id: str) -> typing.Any | None: ...
 
 
+class EventStatusLookupProtocol(typing.Protocol):
+    def get(self, event_id: str) -> typing.Any | None: ...
+
+
+class TicketOutboxRepositoryProtocol(typing.Protocol):
+    async def add(self, ticket_local_id: str) -> None: ...
+
+
+class TransactionProtocol(typing.Protocol):
+    async def commit(self) -> None: ...
+
+
 class TicketRepositoryProtocol(typing.Protocol):
     async def create(
         self,
@@ -27,10 +44,25 @@ class TicketRepositoryProtocol(typing.Protocol):
         seat: str,
     ) -> typing.Any: ...
 
+    async def create_pending(
+        self,
+        event_id: str,
+        first_name: str,
+        last_name: str,
+        email: str,
+        seat: str,
+    ) -> typing.Any: ...
+
+    async def create_many(self, tickets: list[dict]) -> list[str]: ...
+
     async def get_by_local_id(self, local_id: str) -> typing.Any | None: ...
 
     async def delete(self, ticket: typing.Any) -> None: ...
 
+    async def get_many_by_local_ids(self, local_ids: list[str]) -> list[typing.Any]: ...
+
+    async def delete_many(self, ids: list[str]) -> None: ...
+
 
 class EventNotFound(Exception):
     pass
@@ -48,16 +80,28 @@ class TicketNotFound(Exception):
     pass
 
 
+class TicketRegistrationPending(Exception):
+    pass
+
+
+class TicketRegistrationUnknown(Exception):
+    pass
+
+
 class CreateTicketUsecase:
     def __init__(
         self,
         client: EventsProviderClientProtocol,
         events: EventRepositoryProtocol,
         tickets: TicketRepositoryProtocol,
+        statuses: EventStatusLookupProtocol | None = None,
+        transaction: TransactionProtocol | None = None,
     ) -> None:
         self._client = client
         self._events = events
         self._tickets = tickets
+        self._statuses = statuses
+        self._transaction = transaction
 
     async def execute(
         self,
@@ -67,21 +111,9 @@ class CreateTicketUsecase:
         email: str,
         seat: str,
     ) -> str:
-        event = await self._events.get_by_id(event_id)
-        if not event:
-            raise EventNotFound(event_id)
-
-        if event.status != "published":
-            raise EventNotPublished(event_id)
-
-        now = datetime.now(timezone.utc)
-        deadline = event.registration_deadline
-        if deadline.tzinfo is None:
-            from datetime import timezone as tz
-            deadline = deadline.replace(tzinfo=tz.utc)
-        if now > deadline:
-            raise RegistrationDeadlinePassed(event_id)
+        await _ensure_registration_open(event_id, self._events, self._statuses)
 
+        await _release_connection(self._transaction)
         ticket_id = await self._client.register(
             event_id=event_id,
             first_name=first_name,
@@ -90,16 +122,133 @@ class CreateTicketUsecase:
             seat=seat,
         )
 
-        await self._tickets.create(
+        try:
+            await self._tickets.create(
+                event_id=event_id,
+                ticket_id=ticket_id,
+                first_name=first_name,
+                last_name=last_name,
+                email=email,
+                seat=seat,
+            )
+            if self._transaction is not None:
+                await self._transaction.commit()
+        except Exception:
+            # Место у провайдера уже занято, а повтор запроса занял бы второе —
+            # освобождаем его, раз билет не сохранился.
+            try:
+                await self._client.unregister(event_id, ticket_id)
+            except Exception:
+                logger.exception("Failed to release seat of unsaved ticket %s", ticket_id)
+            raise
+
+        return ticket_id
+
+
+class EnqueueTicketUsecase:
+    """Асинхронная регистрация: билет pending и строка outbox в одной транзакции.
+
+    Провайдер вызывается позже фоновым диспетчером, поэтому ответ клиенту не
+    зависит от его задержек.
+    """
+
+    def __init__(
+        self,
+        events: EventRepositoryProtocol,
+        tickets: TicketRepositoryProtocol,
+        outbox: TicketOutboxRepositoryProtocol,
+        statuses: EventStatusLookupProtocol | None = None,
+    ) -> None:
+        self._events = events
+        self._tickets = tickets
+        self._outbox = outbox
+        self._statuses = statuses
+
+    async def execute(
+        self,
+        event_id: str,
+        first_name: str,
+        last_name: str,
+        email: str,
+        seat: str,
+    ) -> str:
+        await _ensure_registration_open(event_id, self._events, self._statuses)
+        ticket = await self._tickets.create_pending(
             event_id=event_id,
-            ticket_id=ticket_id,
             first_name=first_name,
             last_name=last_name,
             email=email,
             seat=seat,
         )
+        await self._outbox.add(ticket.id)
+        return ticket.id
 
-        return ticket_id
+
+@dataclass
+class TicketBatchResult:
+    seat: str
+    ticket_id: str | None = None
+    error: str | None = None
+
+
+class BatchCreateTicketsUsecase:
+    """Групповая регистрация на одно событие.
+
+    Событие проверяется один раз, регистрации у провайдера идут параллельно
+    (не больше concurrency одновременно), успешные билеты вставляются одним
+    INSERT. Ошибка отдельного места не отменяет остальные.
+    """
+
+    def __init__(
+        self,
+        client: EventsProviderClientProtocol,
+        events: EventRepositoryProtocol,
+        tickets: TicketRepositoryProtocol,
+        concurrency: int,
+        statuses: EventStatusLookupProtocol | None = None,
+        transaction: TransactionProtocol | None = None,
+    ) -> None:
+        self._client = client
+        self._events = events
+        self._tickets = tickets
+        self._concurrency = max(concurrency, 1)
+        self._statuses = statuses
+        self._transaction = transaction
+
+    async def execute(self, event_id: str, attendees: list[dict]) -> list[TicketBatchResult]:
+        await _ensure_registration_open(event_id, self._events, self._statuses)
+        await _release_connection(self._transaction)
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def register(attendee: dict) -> TicketBatchResult:
+            result = TicketBatchResult(seat=attendee["seat"])
+            async with semaphore:
+                try:
+                    result.ticket_id = await self._client.register(event_id=event_id, **attendee)
+                except Exception as exc:
+                    logger.warning("Batch registration of seat %s failed: %s", result.seat, exc)
+                    result.error = str(exc) or type(exc).__name__
+            return result
+
+        results = await asyncio.gather(*(register(attendee) for attendee in attendees))
+
+        registered = [
+            {"event_id": event_id, "ticket_id": result.ticket_id, **attendee}
+            for attendee, result in zip(attendees, results)
+            if result.ticket_id is not None
+        ]
+        if registered:
+            try:
+                await self._tickets.create_many(registered)
+            except Exception:
+                # Места у провайдера уже заняты — освобождаем, чтобы не осталось сирот.
+                await asyncio.gather(
+                    *(self._client.unregister(event_id, row["ticket_id"]) for row in registered),
+                    return_exceptions=True,
+                )
+                raise
+        return list(results)
 
 
 class CancelTicketUsecase:
@@ -107,14 +256,136 @@ class CancelTicketUsecase:
         self,
         client: EventsProviderClientProtocol,
         tickets: TicketRepositoryProtocol,
+        transaction: TransactionProtocol | None = None,
     ) -> None:
         self._client = client
         self._tickets = tickets
+        self._transaction = transaction
 
-    async def execute(self, local_ticket_id: str) -> None:
+    async def execute(self, local_ticket_id: str) -> str:
         ticket = await self._tickets.get_by_local_id(local_ticket_id)
         if not ticket:
             raise TicketNotFound(local_ticket_id)
+        if ticket.status == "pending":
+            raise TicketRegistrationPending(local_ticket_id)
+        if ticket.status == "unknown":
+            raise TicketRegistrationUnknown(local_ticket_id)
+
+        await _release_connection(self._transaction)
+        # Неудавшаяся асинхронная регистрация у провайдера не существует.
+        if ticket.ticket_id is not None:
+            await self._client.unregister(ticket.event_id, ticket.ticket_id)
+        await self._tickets.delete(ticket)
+        return ticket.event_id
+
+
+@dataclass
+class TicketCancelResult:
+    ticket_id: str
+    event_id: str | None = None
+    error: str | None = None
+
+
+class BatchCancelTicketsUsecase:
+    """Массовая отмена билетов.
+
+    Билеты загружаются одним запросом, отмены у провайдера идут параллельно
+    (не больше concurrency одновременно), успешно отменённые удаляются одним
+    DELETE. Ненайденные и неотменённые билеты попадают в результат с ошибкой.
+    """
+
+    def __init__(
+        self,
+        client: EventsProviderClientProtocol,
+        tickets: TicketRepositoryProtocol,
+        concurrency: int,
+        transaction: TransactionProtocol | None = None,
+    ) -> None:
+        self._client = client
+        self._tickets = tickets
+        self._concurrency = max(concurrency, 1)
+        self._transaction = transaction
+
+    async def execute(self, local_ticket_ids: list[str]) -> list[TicketCancelResult]:
+        requested = list(dict.fromkeys(local_ticket_ids))
+        found = await self._tickets.get_many_by_local_ids(requested)
+        by_local_id = {}
+        for ticket in found:
+            by_local_id[ticket.id] = ticket
+            if ticket.ticket_id is not None:
+                by_local_id[ticket.ticket_id] = ticket
+        await _release_connection(self._transaction)
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def cancel(ticket: typing.Any) -> str | None:
+            """Отменяет билет у провайдера; возвращает текст ошибки или None."""
+            if ticket.status == "pending":
+                return "Ticket registration is still pending"
+            if ticket.status == "unknown":
+                return "Ticket registration outcome is unknown"
+            if ticket.ticket_id is None:
+                return None
+            async with semaphore:
+                try:
+                    await self._client.unregister(ticket.event_id, ticket.ticket_id)
+                except Exception as exc:
+                    logger.warning("Batch cancellation of ticket %s failed: %s", ticket.id, exc)
+                    return str(exc) or type(exc).__name__
+            return None
+
+        # Локальный id и id провайдера одного билета — один вызов провайдера,
+        # его исход попадает в результат каждого из них.
+        tickets = {
+            by_local_id[local_id].id: by_local_id[local_id]
+            for local_id in requested
+            if local_id in by_local_id
+        }
+        errors = dict(zip(tickets, await asyncio.gather(*map(cancel, tickets.values()))))
+
+        cancelled = [ticket_id for ticket_id, error in errors.items() if error is None]
+        if cancelled:
+            await self._tickets.delete_many(cancelled)
+
+        results = []
+        for local_id in requested:
+            ticket = by_local_id.get(local_id)
+            if ticket is None:
+                results.append(TicketCancelResult(local_id, error="Ticket not found"))
+            else:
+                results.append(
+                    TicketCancelResult(local_id, event_id=ticket.event_id, error=errors[ticket.id])
+                )
+        return results
+
+
+async def _release_connection(transaction: TransactionProtocol | None) -> None:
+    """Закрывает читающую транзакцию перед вызовом провайдера.
+
+    Иначе сессия держит соединение из пула всё время, пока провайдер отвечает;
+    запись после вызова пойдёт в новой короткой транзакции.
+    """
+    if transaction is not None:
+        await transaction.commit()
+
+
+async def _ensure_registration_open(
+    event_id: str,
+    events: EventRepositoryProtocol,
+    statuses: EventStatusLookupProtocol | None,
+) -> None:
+    event = statuses.get(event_id) if statuses is not None else None
+    if event is None:
+        event = await events.get_by_id(event_id)
+    if not event:
+        raise EventNotFound(event_id)
+
+    if event.status != "published":
+        raise EventNotPublished(event_id)
 
-        await self._client.unregister(ticket.event_id, ticket.ticket_id)
-        await self._tickets.delete(ticket)
\ No newline at end of file
+    now = datetime.now(timezone.utc)
+    deadline = event.registration_deadline
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    if now > deadline:
+        raise RegistrationDeadlinePassed(event_id)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from src.core import db
+from src.core.config import settings
+from src.core.db import build_engine, engine
+
+
+def test_engine_does_not_echo_sql_by_default():
+    assert engine.echo is False
+
+
+def test_build_engine_applies_pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_max_overflow", 2)
+    monkeypatch.setattr(settings, "db_pool_recycle", 600)
+
+    built = build_engine("postgresql+asyncpg://u:p@localhost:5432/db")
+
+    assert built.pool.size() == 3
+    assert built.pool._max_overflow == 2
+    assert built.pool._recycle == 600
+    assert built.pool._pre_ping is True
+
+
+def test_reads_use_primary_without_replica():
+    assert db.read_session_factory() is db.SessionLocal
+
+
+def test_reads_go_to_replica_except_right_after_a_write(monkeypatch):
+    monkeypatch.setattr(db, "read_engine", build_engine("postgresql+asyncpg://u:p@replica:5432/db"))
+    monkeypatch.setattr(db, "_primary_reads_until", 0.0)
+
+    assert db.read_session_factory() is db.ReadSessionLocal
+
+    db.mark_primary_write()
+    assert db.read_session_factory() is db.SessionLocal
+
+    monkeypatch.setattr(db, "_primary_reads_until", 0.0)
+    assert db.read_session_factory() is db.ReadSessionLocal
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.infrastructure.db.repositories.event_repository import SqlAlchemyEventRepository
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_name_filter_escapes_like_wildcards():
+    (name_filter,) = SqlAlchemyEventRepository._filters("50%_off", None, None, None)
+    compiled = name_filter.compile(dialect=postgresql.dialect())
+    assert "ESCAPE '\\'" in str(compiled)
+    assert list(compiled.params.values()) == ["%50\\%\\_off%"]
+
+
+@pytest.mark.asyncio
+async def test_list_by_relevance_orders_by_similarity():
+    session = MagicMock()
+    result = MagicMock()
+    result.all = MagicMock(return_value=[])
+    session.execute = AsyncMock(return_value=result)
+    repo = SqlAlchemyEventRepository(session)
+
+    await repo.list(name="jazz", by_relevance=True)
+
+    sql = compile_sql(session.execute.await_args.args[0])
+    assert "ORDER BY similarity(events.name, 'jazz') DESC, events.event_time, events.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_loads_place_in_one_joined_query():
+    session = MagicMock()
+    result = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    repo = SqlAlchemyEventRepository(session)
+
+    await repo.get_by_id("evt")
+
+    session.execute.assert_awaited_once()
+    stmt, params = session.execute.await_args.args
+    assert params == {"event_id": "evt"}
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "JOIN places" in sql
+    assert "events.id = %(event_id)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_list_orm_path_joins_place():
+    session = MagicMock()
+    result = MagicMock()
+    result.all = MagicMock(return_value=[])
+    session.execute = AsyncMock(return_value=result)
+    repo = SqlAlchemyEventRepository(session)
+
+    await repo.list()
+
+    sql = compile_sql(session.execute.await_args.args[0])
+    assert "JOIN places" in sql
+
+
+def make_list_session(rows: list) -> MagicMock:
+    session = MagicMock()
+    result = MagicMock()
+    result.all = MagicMock(return_value=rows)
+    session.execute = AsyncMock(return_value=result)
+    session.scalar = AsyncMock(return_value=123)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_exact_count_uses_narrow_count_without_window():
+    session = make_list_session([MagicMock()] * 2)
+    repo = SqlAlchemyEventRepository(session)
+
+    total, _ = await repo.list(page_size=2, lean=True)
+
+    assert total == 123
+    assert "OVER" not in compile_sql(session.execute.await_args.args[0])
+    count_sql = compile_sql(session.scalar.await_args.args[0])
+    assert "count(*)" in count_sql
+    assert "JOIN" not in count_sql
+
+
+@pytest.mark.asyncio
+async def test_exact_count_is_skipped_on_last_page():
+    session = make_list_session([MagicMock()])
+    repo = SqlAlchemyEventRepository(session)
+
+    total, _ = await repo.list(page=3, page_size=2, lean=True)
+
+    assert total == 5
+    session.scalar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_window_count_is_opt_in():
+    session = make_list_session([MagicMock(total=7)])
+    repo = SqlAlchemyEventRepository(session)
+
+    total, _ = await repo.list(count_mode="window", lean=True)
+
+    assert total == 7
+    assert "count(*) OVER ()" in compile_sql(session.execute.await_args.args[0])
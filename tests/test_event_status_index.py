@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.domain.models import Base, Event, Place, SyncMetadata
+from src.services.event_status_index import EventStatus, EventStatusIndex
+from src.usecases.tickets import CreateTicketUsecase, EventNotPublished
+
+CHANGED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DEADLINE = datetime.now(timezone.utc) + timedelta(days=1)
+
+
+def make_session(version: int, rows: list[tuple]) -> MagicMock:
+    session = MagicMock()
+    session.scalar = AsyncMock(return_value=version)
+    session.execute = AsyncMock(return_value=rows)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_refresh_loads_statuses_and_version():
+    index = EventStatusIndex()
+    assert not index.loaded
+
+    await index.refresh(make_session(3, [("evt", "published", DEADLINE, CHANGED_AT)]))
+
+    assert index.loaded
+    assert index.version == 3
+    assert index.get("evt") == EventStatus("published", DEADLINE)
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_reload_when_version_unchanged():
+    index = EventStatusIndex()
+    await index.refresh(make_session(1, [("evt", "published", DEADLINE, CHANGED_AT)]))
+
+    session = make_session(1, [])
+    await index.refresh(session)
+
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_new_version_reads_only_changed_rows():
+    index = EventStatusIndex()
+    await index.refresh(make_session(1, [("evt", "published", DEADLINE, CHANGED_AT)]))
+
+    session = make_session(2, [("evt", "canceled", DEADLINE, CHANGED_AT + timedelta(hours=1))])
+    await index.refresh(session)
+
+    query = session.execute.await_args.args[0]
+    assert "events.changed_at >=" in str(query)
+    assert index.get("evt").status == "canceled"
+
+
+@pytest.mark.asyncio
+async def test_create_ticket_checks_status_without_db():
+    statuses = MagicMock()
+    statuses.get = MagicMock(return_value=EventStatus("draft", DEADLINE))
+    events = SimpleNamespace(get_by_id=AsyncMock())
+    usecase = CreateTicketUsecase(
+        client=AsyncMock(), events=events, tickets=AsyncMock(), statuses=statuses
+    )
+
+    with pytest.raises(EventNotPublished):
+        await usecase.execute("evt", "Ivan", "Ivanov", "ivan@example.com", "A1")
+
+    events.get_by_id.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_late_row_inside_overlap_window(tmp_path):
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'index.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[Place.__table__, Event.__table__, SyncMetadata.__table__],
+        )
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def make_event(event_id: str, changed_at: datetime) -> Event:
+        return Event(
+            id=event_id, name=event_id, event_time=DEADLINE + timedelta(days=1),
+            registration_deadline=DEADLINE, status="published", number_of_visitors=0,
+            changed_at=changed_at, created_at=CHANGED_AT, status_changed_at=CHANGED_AT,
+            place_id="p1",
+        )
+
+    async with factory() as session:
+        session.add(Place(
+            id="p1", name="Hall", city="Moscow", address="Tverskaya 1",
+            seats_pattern="A1-10", changed_at=CHANGED_AT, created_at=CHANGED_AT,
+        ))
+        session.add(make_event("A", CHANGED_AT - timedelta(minutes=5)))
+        session.add(make_event("B", CHANGED_AT))
+        session.add(SyncMetadata(sync_version=1))
+        await session.commit()
+
+    index = EventStatusIndex(overlap_seconds=300)
+    try:
+        async with factory() as session:
+            await index.refresh(session)
+
+            # Синхронизация с перекрытием отменила A задним числом.
+            await session.execute(
+                update(Event)
+                .where(Event.id == "A")
+                .values(status="canceled", changed_at=CHANGED_AT - timedelta(minutes=2))
+            )
+            await session.execute(update(SyncMetadata).values(sync_version=2))
+            await session.commit()
+
+            await index.refresh(session)
+    finally:
+        await engine.dispose()
+
+    assert index.get("A").status == "canceled"
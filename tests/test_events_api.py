@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.response_cache import ResponseCache, dumps, get_response_cache
+from src.api.routes import events as events_routes
+from src.domain.schemas.event import EventListItem, event_list_item_from_row
+from src.infrastructure.db.session import get_read_session, get_session
+from src.services.event_status_index import get_event_status_index
+from src.main import app
+
+
+def make_row(event_id: str, hour: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        name=f"Event {event_id}",
+        event_time=datetime(2026, 1, 1, hour, tzinfo=timezone.utc),
+        registration_deadline=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        status="published",
+        number_of_visitors=0,
+        place_id="p1",
+        place_name="Hall",
+        place_city="Moscow",
+        place_address="Tverskaya 1",
+        place_seats_pattern="A1-10",
+    )
+
+
+def make_event(event_id: str, hour: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        name=f"Event {event_id}",
+        place=SimpleNamespace(
+            id="p1", name="Hall", city="Moscow", address="Tverskaya 1", seats_pattern="A1-10"
+        ),
+        event_time=datetime(2026, 1, 1, hour, tzinfo=timezone.utc),
+        registration_deadline=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        status="published",
+        number_of_visitors=0,
+    )
+
+
+@pytest.fixture
+def repo(monkeypatch) -> AsyncMock:
+    repo = AsyncMock()
+    monkeypatch.setattr(events_routes, "SqlAlchemyEventRepository", lambda session: repo)
+
+    async def fake_session():
+        yield None
+
+    app.dependency_overrides[get_session] = fake_session
+    app.dependency_overrides[get_read_session] = fake_session
+    yield repo
+    app.dependency_overrides.clear()
+
+
+def test_cursor_roundtrip():
+    event_time = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = events_routes._encode_cursor(event_time, "evt-1")
+    assert events_routes._decode_cursor(cursor) == (event_time, "evt-1")
+
+
+def test_invalid_cursor_returns_400(repo):
+    resp = TestClient(app).get("/api/events", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+def test_cursor_mode_returns_next_cursor(repo):
+    repo.count.return_value = 3
+    repo.list_after.return_value = [make_row("1", 10), make_row("2", 11), make_row("3", 12)]
+
+    resp = TestClient(app).get("/api/events", params={"cursor": "", "page_size": 2})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [e["id"] for e in body["results"]] == ["1", "2"]
+    assert repo.list_after.await_args.kwargs["after"] is None
+    assert repo.list_after.await_args.kwargs["limit"] == 3
+
+    next_cursor = body["next"].split("cursor=")[1].split("&")[0]
+    assert events_routes._decode_cursor(next_cursor) == (
+        datetime(2026, 1, 1, 11, tzinfo=timezone.utc),
+        "2",
+    )
+
+
+def test_page_mode_is_unchanged(repo):
+    repo.list.return_value = (45, [make_row("1", 10)])
+
+    resp = TestClient(app).get("/api/events", params={"page": 2, "page_size": 20})
+
+    body = resp.json()
+    assert body["count"] == 45
+    assert "page=3" in body["next"]
+    assert "page=1" in body["previous"]
+
+
+def test_page_mode_without_count_uses_lookahead(repo):
+    repo.list.return_value = (None, [make_row("1", 10), make_row("2", 11), make_row("3", 12)])
+
+    resp = TestClient(app).get("/api/events", params={"page_size": 2, "count": "none"})
+
+    body = resp.json()
+    assert body["count"] is None
+    assert len(body["results"]) == 2
+    assert "page=2" in body["next"]
+    assert "count=none" in body["next"]
+    assert repo.list.await_args.kwargs["lookahead"] == 1
+
+
+def test_page_mode_without_count_last_page(repo):
+    repo.list.return_value = (1234, [make_row("1", 10)])
+
+    resp = TestClient(app).get("/api/events", params={"page_size": 2, "count": "estimate"})
+
+    body = resp.json()
+    assert body["count"] == 1234
+    assert body["next"] is None
+    assert repo.list.await_args.kwargs["count_mode"] == "estimate"
+
+
+@pytest.fixture
+def generation(repo):
+    state = SimpleNamespace(version=1, get=lambda event_id: None)
+    app.dependency_overrides[get_event_status_index] = lambda: state
+    state.clock = SimpleNamespace(now=0.0)
+    cache = ResponseCache(max_entries=100, max_age=30, ttl=60, clock=lambda: state.clock.now)
+    app.dependency_overrides[get_response_cache] = lambda: cache
+    return state
+
+
+def test_list_is_served_from_cache_within_generation(repo, generation):
+    repo.list.return_value = (1, [make_row("1", 10)])
+    client = TestClient(app)
+
+    first = client.get("/api/events", params={"page_size": 20, "page": 1})
+    second = client.get("/api/events", params={"page": 1, "page_size": 20})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.headers["etag"] == second.headers["etag"]
+    assert "max-age=30" in first.headers["cache-control"]
+    repo.list.assert_awaited_once()
+
+
+def test_matching_if_none_match_returns_304(repo, generation):
+    repo.get_by_id.return_value = make_event("1", 10)
+    client = TestClient(app)
+
+    etag = client.get("/api/events/1").headers["etag"]
+    resp = client.get("/api/events/1", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+def test_new_sync_generation_invalidates_cached_responses(repo, generation):
+    repo.list.return_value = (1, [make_row("1", 10)])
+    client = TestClient(app)
+
+    etag = client.get("/api/events").headers["etag"]
+    generation.version = 2
+    resp = client.get("/api/events", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert repo.list.await_count == 2
+
+
+def test_missing_event_is_not_cached(repo, generation):
+    repo.get_by_id.return_value = None
+    client = TestClient(app)
+
+    assert client.get("/api/events/missing").status_code == 404
+    assert client.get("/api/events/missing").status_code == 404
+    assert repo.get_by_id.await_count == 2
+
+
+def test_lean_list_item_matches_pydantic_serialization():
+    row = make_row("1", 10)
+    event = make_event("1", 10)
+
+    lean = orjson.loads(dumps(event_list_item_from_row(row)))
+    validated = json.loads(EventListItem.model_validate(event).model_dump_json())
+
+    assert lean == validated
+
+
+def test_seats_served_stale_while_provider_circuit_is_open():
+    from src.infrastructure.cache.seats_cache import InMemoryCache, SeatsCache, get_seats_cache
+    from src.infrastructure.clients.events_provider import get_events_client
+    from src.infrastructure.clients.resilience import ProviderUnavailable
+
+    async def fake_session():
+        yield None
+
+    stale_entries = InMemoryCache(max_entries=10)
+    cache = SeatsCache(
+        local=InMemoryCache(max_entries=10),
+        ttl=30,
+        stale=stale_entries,
+        stale_ttl=600,
+    )
+    client = SimpleNamespace(seats=AsyncMock(side_effect=ProviderUnavailable()))
+    statuses = SimpleNamespace(get=lambda event_id: SimpleNamespace(status="published"))
+    app.dependency_overrides[get_session] = fake_session
+    app.dependency_overrides[get_seats_cache] = lambda: cache
+    app.dependency_overrides[get_events_client] = lambda: client
+    app.dependency_overrides[get_event_status_index] = lambda: statuses
+    try:
+        http = TestClient(app)
+        missing = http.get("/api/events/evt/seats")
+        asyncio.run(stale_entries.set("seats:evt", ["A1"], ttl=600))
+        stale = http.get("/api/events/evt/seats")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert missing.status_code == 503
+    assert stale.status_code == 200
+    assert stale.json()["available_seats"] == ["A1"]
+    assert stale.headers["x-stale-data"] == "true"
+
+
+def test_cached_response_expires_after_ttl(repo, generation):
+    repo.list.return_value = (1, [make_row("1", 10)])
+    client = TestClient(app)
+
+    client.get("/api/events")
+    generation.clock.now = 61
+    client.get("/api/events")
+
+    assert repo.list.await_count == 2
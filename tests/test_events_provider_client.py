@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -10,13 +10,12 @@ BASE_URL = "http://fake-provider.test"
 API_KEY = "test-key"
 
 
-@pytest.fixture
-def client() -> EventsProviderClient:
-    return EventsProviderClient(base_url=BASE_URL, api_key=API_KEY)
+def make_client(http_client: MagicMock) -> EventsProviderClient:
+    return EventsProviderClient(base_url=BASE_URL, api_key=API_KEY, http_client=http_client)
 
 
 @pytest.mark.asyncio
-async def test_events_since_returns_parsed_json(client):
+async def test_events_since_returns_parsed_json():
     fake_response = {
         "next": None,
         "previous": None,
@@ -30,11 +29,9 @@ async def test_events_since_returns_parsed_json(client):
     mock_get = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.get = mock_get
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        result = await client.events_since("2000-01-01")
+    client = make_client(mock_http_client)
+    result = await client.events_since("2000-01-01")
 
     assert result["results"][0]["id"] == "abc"
     mock_get.assert_called_once()
@@ -43,7 +40,7 @@ async def test_events_since_returns_parsed_json(client):
 
 
 @pytest.mark.asyncio
-async def test_events_since_sends_api_key_header(client):
+async def test_events_since_sends_api_key_header():
     mock_resp = MagicMock()
     mock_resp.raise_for_status = MagicMock()
     mock_resp.json = MagicMock(return_value={"next": None, "results": []})
@@ -51,18 +48,16 @@ async def test_events_since_sends_api_key_header(client):
     mock_get = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.get = mock_get
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        await client.events_since("2000-01-01")
+    client = make_client(mock_http_client)
+    await client.events_since("2000-01-01")
 
     headers = mock_get.call_args.kwargs.get("headers", {})
     assert headers.get("x-api-key") == API_KEY
 
 
 @pytest.mark.asyncio
-async def test_register_returns_ticket_id(client):
+async def test_register_returns_ticket_id():
     mock_resp = MagicMock()
     mock_resp.status_code = 201
     mock_resp.json = MagicMock(return_value={"ticket_id": "ticket-uuid-123"})
@@ -70,23 +65,21 @@ async def test_register_returns_ticket_id(client):
     mock_post = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.post = mock_post
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        ticket_id = await client.register(
-            event_id="event-1",
-            first_name="Ivan",
-            last_name="Ivanov",
-            email="ivan@example.com",
-            seat="A1",
-        )
+    client = make_client(mock_http_client)
+    ticket_id = await client.register(
+        event_id="event-1",
+        first_name="Ivan",
+        last_name="Ivanov",
+        email="ivan@example.com",
+        seat="A1",
+    )
 
     assert ticket_id == "ticket-uuid-123"
 
 
 @pytest.mark.asyncio
-async def test_register_raises_on_non_201(client):
+async def test_register_raises_on_non_201():
     mock_resp = MagicMock()
     mock_resp.status_code = 400
     mock_resp.text = "seat already taken"
@@ -94,22 +87,20 @@ async def test_register_raises_on_non_201(client):
     mock_post = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.post = mock_post
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        with pytest.raises(ValueError, match="Register failed"):
-            await client.register(
-                event_id="event-1",
-                first_name="Ivan",
-                last_name="Ivanov",
-                email="ivan@example.com",
-                seat="A1",
-            )
+    client = make_client(mock_http_client)
+    with pytest.raises(ValueError, match="Register failed"):
+        await client.register(
+            event_id="event-1",
+            first_name="Ivan",
+            last_name="Ivanov",
+            email="ivan@example.com",
+            seat="A1",
+        )
 
 
 @pytest.mark.asyncio
-async def test_unregister_returns_true_on_success(client):
+async def test_unregister_returns_true_on_success():
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json = MagicMock(return_value={"success": True})
@@ -117,17 +108,15 @@ async def test_unregister_returns_true_on_success(client):
     mock_request = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.request = mock_request
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        result = await client.unregister("event-1", "ticket-uuid-123")
+    client = make_client(mock_http_client)
+    result = await client.unregister("event-1", "ticket-uuid-123")
 
     assert result is True
 
 
 @pytest.mark.asyncio
-async def test_unregister_raises_on_failure(client):
+async def test_unregister_raises_on_failure():
     mock_resp = MagicMock()
     mock_resp.status_code = 404
     mock_resp.text = "not found"
@@ -135,16 +124,14 @@ async def test_unregister_raises_on_failure(client):
     mock_request = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.request = mock_request
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        with pytest.raises(ValueError, match="Unregister failed"):
-            await client.unregister("event-1", "ticket-uuid-123")
+    client = make_client(mock_http_client)
+    with pytest.raises(ValueError, match="Unregister failed"):
+        await client.unregister("event-1", "ticket-uuid-123")
 
 
 @pytest.mark.asyncio
-async def test_seats_returns_list(client):
+async def test_seats_returns_list():
     mock_resp = MagicMock()
     mock_resp.raise_for_status = MagicMock()
     mock_resp.json = MagicMock(return_value={"seats": ["A1", "A2", "B5"]})
@@ -152,10 +139,26 @@ async def test_seats_returns_list(client):
     mock_get = AsyncMock(return_value=mock_resp)
     mock_http_client = MagicMock()
     mock_http_client.get = mock_get
-    mock_http_client.__aenter__ = AsyncMock(return_value=mock_http_client)
-    mock_http_client.__aexit__ = AsyncMock(return_value=False)
 
-    with patch("httpx.AsyncClient", return_value=mock_http_client):
-        seats = await client.seats("event-1")
+    client = make_client(mock_http_client)
+    seats = await client.seats("event-1")
+
+    assert seats == ["A1", "A2", "B5"]
+
+
+@pytest.mark.asyncio
+async def test_calls_reuse_shared_http_client():
+    mock_resp = MagicMock()
+    mock_resp.raise_for_status = MagicMock()
+    mock_resp.json = MagicMock(return_value={"next": None, "results": [], "seats": []})
+
+    mock_get = AsyncMock(return_value=mock_resp)
+    mock_http_client = MagicMock()
+    mock_http_client.get = mock_get
+
+    client = make_client(mock_http_client)
+    await client.events_since("2000-01-01")
+    await client.events(cursor_url="http://fake-provider.test/api/events/?page=2")
+    await client.seats("event-1")
 
-    assert seats == ["A1", "A2", "B5"]
\ No newline at end of file
+    assert mock_get.call_count == 3
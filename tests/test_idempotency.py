@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.routes import events as events_routes
+from src.domain.models import Base, IdempotencyKey
+from src.infrastructure.cache.seats_cache import get_seats_cache
+from src.infrastructure.clients.resilience import ProviderTemporaryError
+from src.infrastructure.db.session import get_session
+from src.main import app
+from src.services.event_status_index import get_event_status_index
+from src.services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyStore,
+    StoredResponse,
+    get_idempotency_store,
+)
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[IdempotencyKey.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_store(session_factory, **kwargs) -> IdempotencyStore:
+    options = {"ttl": 3600, "lock_timeout": 60, "wait_timeout": 1, "poll_interval": 0.01}
+    options.update(kwargs)
+    return IdempotencyStore(session_factory, **options)
+
+
+@pytest.mark.asyncio
+async def test_completed_key_returns_stored_response(session_factory):
+    store = make_store(session_factory)
+
+    assert await store.begin("k1", "fp") is None
+    await store.complete("k1", 201, {"ticket_id": "t-1"})
+
+    assert await store.begin("k1", "fp") == StoredResponse(201, {"ticket_id": "t-1"})
+
+
+@pytest.mark.asyncio
+async def test_same_key_with_different_body_is_rejected(session_factory):
+    store = make_store(session_factory)
+    await store.begin("k1", "fp")
+
+    with pytest.raises(IdempotencyKeyMismatch):
+        await store.begin("k1", "other")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_in_flight_attempt(session_factory):
+    store = make_store(session_factory)
+    assert await store.begin("k1", "fp") is None
+
+    duplicate = asyncio.create_task(store.begin("k1", "fp"))
+    await asyncio.sleep(0.05)
+    assert not duplicate.done()
+
+    await store.complete("k1", 201, {"ticket_id": "t-1"})
+
+    assert (await duplicate).body == {"ticket_id": "t-1"}
+
+
+@pytest.mark.asyncio
+async def test_duplicate_gives_up_after_wait_timeout(session_factory):
+    store = make_store(session_factory, wait_timeout=0.05)
+    await store.begin("k1", "fp")
+
+    with pytest.raises(IdempotencyKeyInProgress):
+        await store.begin("k1", "fp")
+
+
+@pytest.mark.asyncio
+async def test_expired_lock_is_taken_over(session_factory):
+    store = make_store(session_factory, lock_timeout=0)
+    await store.begin("k1", "fp")
+
+    assert await store.begin("k1", "fp") is None
+
+
+@pytest.mark.asyncio
+async def test_released_key_can_be_retried_and_expired_keys_are_purged(session_factory):
+    store = make_store(session_factory, ttl=0)
+    await store.begin("k1", "fp")
+    await store.release("k1")
+    assert await store.begin("k1", "fp") is None
+    await store.complete("k1", 201, {"ticket_id": "t-1"})
+
+    assert await store.purge_expired() == 1
+
+
+def test_retry_with_same_key_does_not_call_provider_again(session_factory, monkeypatch):
+    calls = 0
+
+    async def fake_create(payload, session, events_client, seats_cache, statuses):
+        nonlocal calls
+        calls += 1
+        return 201, {"ticket_id": f"t-{calls}"}
+
+    async def fake_session():
+        yield None
+
+    monkeypatch.setattr(events_routes, "_create_ticket", fake_create)
+    store = make_store(session_factory)
+    app.dependency_overrides[get_session] = fake_session
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.dependency_overrides[events_routes.get_events_client] = lambda: None
+    payload = {
+        "event_id": "evt",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "email": "ivan@example.com",
+        "seat": "A1",
+    }
+    try:
+        client = TestClient(app)
+        first = client.post("/api/tickets", json=payload, headers={"Idempotency-Key": "abc"})
+        retry = client.post("/api/tickets", json=payload, headers={"Idempotency-Key": "abc"})
+        other_body = client.post(
+            "/api/tickets", json={**payload, "seat": "A2"}, headers={"Idempotency-Key": "abc"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert calls == 1
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json() == {"ticket_id": "t-1"}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert other_body.status_code == 422
+
+
+def test_response_mode_is_part_of_the_key_and_replay_keeps_headers(
+    session_factory, monkeypatch
+):
+    async def fake_create(payload, session, events_client, seats_cache, statuses):
+        return 201, {"ticket_id": "t-1"}
+
+    async def fake_enqueue(payload, session, statuses):
+        return 202, {"id": "local-1", "status": "pending"}
+
+    async def fake_session():
+        yield None
+
+    monkeypatch.setattr(events_routes, "_create_ticket", fake_create)
+    monkeypatch.setattr(events_routes, "_enqueue_ticket", fake_enqueue)
+    store = make_store(session_factory)
+    app.dependency_overrides[get_session] = fake_session
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.dependency_overrides[events_routes.get_events_client] = lambda: None
+    payload = {
+        "event_id": "evt",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "email": "ivan@example.com",
+        "seat": "A1",
+    }
+    async_headers = {"Idempotency-Key": "abc", "Prefer": "respond-async"}
+    try:
+        client = TestClient(app)
+        first = client.post("/api/tickets", json=payload, headers=async_headers)
+        replay = client.post("/api/tickets", json=payload, headers=async_headers)
+        sync_retry = client.post("/api/tickets", json=payload, headers={"Idempotency-Key": "abc"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == replay.status_code == 202
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.headers["location"] == "/api/tickets/local-1"
+    assert replay.headers["preference-applied"] == "respond-async"
+    assert sync_retry.status_code == 422
+
+
+def test_transient_provider_error_is_not_stored_under_the_key(session_factory):
+    class FlakyProvider:
+        calls = 0
+
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                raise ProviderTemporaryError("Register failed: 503 busy", 503)
+            return "t-1"
+
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+
+    async def fake_session():
+        yield session
+
+    provider = FlakyProvider()
+    published = SimpleNamespace(
+        status="published",
+        registration_deadline=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    app.dependency_overrides[get_session] = fake_session
+    app.dependency_overrides[get_idempotency_store] = lambda: make_store(session_factory)
+    app.dependency_overrides[events_routes.get_events_client] = lambda: provider
+    app.dependency_overrides[get_seats_cache] = lambda: SimpleNamespace(invalidate=AsyncMock())
+    app.dependency_overrides[get_event_status_index] = lambda: SimpleNamespace(
+        get=lambda event_id: published
+    )
+    payload = {
+        "event_id": "evt",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        "email": "ivan@example.com",
+        "seat": "A1",
+    }
+    try:
+        client = TestClient(app)
+        first = client.post("/api/tickets", json=payload, headers={"Idempotency-Key": "abc"})
+        retry = client.post("/api/tickets", json=payload, headers={"Idempotency-Key": "abc"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 503
+    assert retry.status_code == 201
+    assert retry.json() == {"ticket_id": "t-1"}
+    assert provider.calls == 2
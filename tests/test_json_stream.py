@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.infrastructure.clients.json_stream import iter_array_items
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def parse(data: bytes, size: int) -> tuple[list, dict]:
+    fields: dict = {}
+    items = [item async for item in iter_array_items(chunked(data, size), "results", fields)]
+    return items, fields
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+async def test_items_and_fields_survive_any_chunk_boundary(size):
+    page = {
+        "count": 12345,
+        "next": "http://provider/api/events/?cursor=abc",
+        "results": [
+            {"id": "1", "name": "Концерт \"Весна\"", "visitors": 1.5e3},
+            {"id": "2", "name": "Спектакль", "tags": [], "place": {"seats": ["A1", "A2"]}},
+        ],
+        "previous": None,
+    }
+
+    items, fields = await parse(json.dumps(page, ensure_ascii=False).encode(), size)
+
+    assert items == page["results"]
+    assert fields == {"count": 12345, "next": page["next"], "previous": None}
+
+
+@pytest.mark.asyncio
+async def test_empty_results_and_trailing_number():
+    items, fields = await parse(b'{"results": [], "count": 1000}', 2)
+
+    assert items == []
+    assert fields == {"count": 1000}
+
+
+@pytest.mark.asyncio
+async def test_truncated_stream_raises():
+    with pytest.raises(ValueError):
+        await parse(b'{"results": [{"id": "1"}, {"id"', 4)
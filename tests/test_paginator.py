@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from unittest.mock import AsyncMock
 
+import httpx
 import pytest
 
+from src.infrastructure.clients.events_provider import EventsProviderClient
 from src.infrastructure.clients.paginator import EventsPaginator
 
 
@@ -54,4 +58,106 @@ async def test_paginator_empty():
     pages = [{"next": None, "results": []}]
     client = make_client(pages)
     collected = [e async for e in EventsPaginator(client)]
-    assert collected == []
\ No newline at end of file
+    assert collected == []
+
+@pytest.mark.asyncio
+async def test_paginator_skips_empty_intermediate_page():
+    pages = [
+        {"next": "http://fake/page2", "results": []},
+        {"next": None, "results": [{"id": "1"}]},
+    ]
+    client = make_client(pages)
+    collected = [e async for e in EventsPaginator(client)]
+    assert [e["id"] for e in collected] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_yields_pages_with_cursor():
+    pages = [
+        {"next": "http://fake/page2", "results": [{"id": "1"}, {"id": "2"}]},
+        {"next": None, "results": [{"id": "3"}]},
+    ]
+    client = make_client(pages)
+    collected = [p async for p in EventsPaginator(client).iter_pages()]
+    assert [len(p.results) for p in collected] == [2, 1]
+    assert [p.next_url for p in collected] == ["http://fake/page2", None]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_preserves_order():
+    pages = [
+        {"next": f"http://fake/page{i + 2}", "results": [{"id": str(i)}]} for i in range(4)
+    ] + [{"next": None, "results": [{"id": "4"}]}]
+    client = make_client(pages)
+    collected = [e async for e in EventsPaginator(client, prefetch=2)]
+    assert [e["id"] for e in collected] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_reads_ahead_but_stays_bounded():
+    pages = [
+        {"next": f"http://fake/page{i + 2}", "results": [{"id": str(i)}]} for i in range(9)
+    ] + [{"next": None, "results": [{"id": "9"}]}]
+    client = make_client(pages)
+    pages_iter = EventsPaginator(client, prefetch=2).iter_pages()
+
+    await pages_iter.__anext__()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    fetched = client.events_since.await_count + client.events.await_count
+    # текущая страница + 2 в очереди + 1 ожидающая места в очереди
+    assert 1 < fetched <= 4
+    await pages_iter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_propagates_errors():
+    client = AsyncMock()
+    client.events_since = AsyncMock(
+        return_value={"next": "http://fake/page2", "results": [{"id": "1"}]}
+    )
+    client.events = AsyncMock(side_effect=RuntimeError("provider down"))
+
+    collected = []
+    with pytest.raises(RuntimeError, match="provider down"):
+        async for e in EventsPaginator(client, prefetch=1):
+            collected.append(e)
+    assert [e["id"] for e in collected] == ["1"]
+
+
+def make_streaming_client(pages: dict[str, dict]) -> EventsProviderClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.dumps(pages[str(request.url)]).encode()
+        # Отдаём тело мелкими кусками, как медленная сеть.
+        return httpx.Response(200, stream=ChunkedStream(body))
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return EventsProviderClient(base_url="http://fake", api_key="key", http_client=http)
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def __aiter__(self):
+        for start in range(0, len(self._body), 5):
+            yield self._body[start:start + 5]
+
+
+@pytest.mark.asyncio
+async def test_stream_mode_yields_rows_and_follows_next():
+    first = "http://fake/api/events/?changed_at=2000-01-01"
+    client = make_streaming_client({
+        first: {"next": "http://fake/page2", "count": 3, "results": [{"id": "1"}, {"id": "2"}]},
+        "http://fake/page2": {"results": [{"id": "3"}], "next": None, "count": 3},
+    })
+
+    seen = []
+    async for page in EventsPaginator(client, stream=True, prefetch=2).iter_pages():
+        seen.append((page.url, [row["id"] async for row in page.rows()], page.count))
+
+    assert seen == [
+        (first, ["1", "2"], 3),
+        ("http://fake/page2", ["3"], 3),
+    ]
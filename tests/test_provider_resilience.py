@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.infrastructure.clients.events_provider import EventsProviderClient
+from src.infrastructure.clients.resilience import (
+    CircuitBreaker,
+    ProviderRejected,
+    ProviderTemporaryError,
+    ProviderUnavailable,
+    RetryPolicy,
+    TokenBucket,
+)
+
+BASE_URL = "http://fake-provider.test"
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0.0)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(handler, **kwargs) -> tuple[EventsProviderClient, list[httpx.Request]]:
+    requests: list[httpx.Request] = []
+
+    async def recording(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return await handler(request)
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(recording))
+    kwargs.setdefault("retry", NO_DELAY)
+    client = EventsProviderClient(base_url=BASE_URL, api_key="key", http_client=http, **kwargs)
+    return client, requests
+
+
+def responses(*items):
+    queue = list(items)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        item = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_idempotent_get_is_retried_on_5xx():
+    handler = responses(
+        httpx.Response(503),
+        httpx.Response(200, json={"seats": ["A1"]}),
+    )
+    client, requests = make_client(handler)
+
+    assert await client.seats("evt") == ["A1"]
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_internal_error_mid_pagination_is_retried():
+    handler = responses(
+        httpx.Response(500),
+        httpx.Response(200, json={"next": None, "results": []}),
+    )
+    client, requests = make_client(handler)
+
+    page = await client.events(cursor_url=f"{BASE_URL}/api/events/?page=2")
+
+    assert page["results"] == []
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_connection_error_mid_pagination_is_retried():
+    handler = responses(
+        httpx.ConnectError("reset"),
+        httpx.Response(200, json={"next": None, "results": []}),
+    )
+    client, requests = make_client(handler)
+
+    page = await client.events(cursor_url=f"{BASE_URL}/api/events/?page=2")
+
+    assert page["results"] == []
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_register_is_not_retried():
+    client, requests = make_client(responses(httpx.Response(503, text="busy")))
+
+    with pytest.raises(ProviderTemporaryError, match="Register failed") as exc_info:
+        await client.register("evt", "Ivan", "Ivanov", "ivan@example.com", "A1")
+
+    assert exc_info.value.status_code == 503
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_conflict_is_a_rejection():
+    client, _ = make_client(responses(httpx.Response(409, text="seat taken")))
+
+    with pytest.raises(ProviderRejected, match="409"):
+        await client.register("evt", "Ivan", "Ivanov", "ivan@example.com", "A1")
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts():
+    client, requests = make_client(responses(httpx.Response(503)))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.seats("evt")
+
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_call_hits_per_call_timeout():
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"seats": []})
+
+    client, requests = make_client(
+        slow, timeouts={"seats": 0.01}, retry=RetryPolicy(attempts=2, base_delay=0.0)
+    )
+
+    with pytest.raises(TimeoutError):
+        await client.seats("evt")
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast_then_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    handler = responses(
+        httpx.Response(500),
+        httpx.Response(500),
+        httpx.Response(200, json={"seats": ["B2"]}),
+    )
+    client, requests = make_client(handler, breaker=breaker, retry=RetryPolicy(attempts=1))
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.seats("evt")
+    assert breaker.is_open
+
+    with pytest.raises(ProviderUnavailable):
+        await client.seats("evt")
+    assert len(requests) == 2
+
+    clock.now = 30
+    assert await client.seats("evt") == ["B2"]
+    assert not breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    client, _ = make_client(responses(httpx.Response(404)), breaker=breaker)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.seats("evt")
+
+    assert not breaker.is_open
+
+
+class StalledStream(httpx.AsyncByteStream):
+    """Тело, которое отдаёт начало страницы и дальше либо зависает, либо рвётся."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self._error = error
+
+    async def __aiter__(self):
+        yield b'{"next": null, "results": [{"id": "1"}, '
+        if self._error is not None:
+            raise self._error
+        await asyncio.sleep(10)
+        yield b'{"id": "2"}]}'
+
+
+@pytest.mark.asyncio
+async def test_stream_body_read_is_bounded_by_events_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    client, _ = make_client(
+        responses(httpx.Response(200, stream=StalledStream())),
+        breaker=breaker,
+        timeouts={"events": 0.05},
+    )
+
+    seen = []
+    with pytest.raises(TimeoutError):
+        async with client.stream_events(f"{BASE_URL}/api/events/") as page:
+            async for row in page.rows():
+                seen.append(row["id"])
+
+    assert seen == ["1"]
+    assert breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_stream_body_reset_is_counted_by_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    client, requests = make_client(
+        responses(httpx.Response(200, stream=StalledStream(httpx.ReadError("reset")))),
+        breaker=breaker,
+    )
+
+    with pytest.raises(httpx.ReadError):
+        async with client.stream_events(f"{BASE_URL}/api/events/") as page:
+            async for _ in page.rows():
+                pass
+
+    assert breaker.is_open
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_delays_requests_over_rate():
+    clock = FakeClock()
+    waits: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        waits.append(delay)
+
+    bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=sleep)
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert waits == pytest.approx([0.1, 0.2])
+
+
+def test_retry_delay_uses_full_jitter_with_cap():
+    policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=3.0, rng=lambda: 0.5)
+
+    assert [policy.delay(n) for n in range(4)] == [0.5, 1.0, 1.5, 1.5]
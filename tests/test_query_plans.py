@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, text, tuple_, union_all
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.domain.models import Base, Event, Ticket
+from src.infrastructure.db.repositories.event_repository import (
+    SqlAlchemyEventRepository,
+    _Explain,
+)
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL (postgresql+asyncpg://...) не задан",
+)
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+@pytest.fixture
+async def conn():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.connect() as connection:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        # На пустых таблицах seq scan всегда дешевле; проверяем, что индекс вообще применим.
+        await connection.execute(text("SET enable_seqscan = off"))
+        yield connection
+        await connection.rollback()
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.commit()
+    await engine.dispose()
+
+
+async def explain(conn, stmt) -> dict:
+    plan = (await conn.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+EVENT_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "stmt",
+    [
+        pytest.param(
+            select(Event)
+            .where(Event.status == "published")
+            .order_by(Event.event_time, Event.id)
+            .limit(20),
+            id="list-by-status",
+        ),
+        pytest.param(
+            select(Event)
+            .where(tuple_(Event.event_time, Event.id) > tuple_(EVENT_TIME, "evt"))
+            .order_by(Event.event_time, Event.id)
+            .limit(20),
+            id="list-keyset",
+        ),
+        pytest.param(
+            select(Event).where(*SqlAlchemyEventRepository._filters("jazz", None, None, None)),
+            id="list-by-name",
+        ),
+        pytest.param(select(Event).where(Event.place_id == "p1"), id="events-by-place"),
+        pytest.param(select(Ticket).where(Ticket.event_id == "evt"), id="tickets-by-event"),
+        pytest.param(
+            union_all(
+                select(Ticket).where(Ticket.ticket_id == "t1"),
+                select(Ticket).where(Ticket.id == "t1"),
+            ).limit(1),
+            id="ticket-by-local-id",
+        ),
+    ],
+)
+async def test_main_queries_do_not_seq_scan(conn, stmt):
+    plan = await explain(conn, stmt)
+    assert seq_scans(plan) == []
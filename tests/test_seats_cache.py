@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.cache.seats_cache import InMemoryCache, SeatsCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_expires_entries():
+    clock = FakeClock()
+    cache = InMemoryCache(max_entries=10, clock=clock)
+
+    await cache.set("a", [1], ttl=30)
+    clock.now = 29
+    assert await cache.get("a") == [1]
+    clock.now = 30
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(max_entries=2)
+
+    await cache.set("a", 1, ttl=30)
+    await cache.set("b", 2, ttl=30)
+    await cache.get("a")
+    await cache.set("c", 3, ttl=30)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_call_loader_once():
+    cache = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30)
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return ["A1", "A2"]
+
+    loader_mock = AsyncMock(side_effect=loader)
+    tasks = [asyncio.create_task(cache.get_or_load("evt", loader_mock)) for _ in range(20)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert all(r == ["A1", "A2"] for r in results)
+    loader_mock.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_loader_error_is_shared_and_not_cached():
+    cache = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30)
+
+    async def failing_loader():
+        await asyncio.sleep(0)
+        raise RuntimeError("provider down")
+
+    loader = AsyncMock(side_effect=failing_loader)
+
+    results = await asyncio.gather(
+        cache.get_or_load("evt", loader),
+        cache.get_or_load("evt", loader),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    loader.assert_awaited_once()
+    assert await cache.get("evt") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_visible_to_other_workers_and_invalidated():
+    shared = InMemoryCache(max_entries=10)
+    worker_1 = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30, shared=shared)
+    worker_2 = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30, shared=shared)
+
+    await worker_1.get_or_load("evt", AsyncMock(return_value=["A1"]))
+    loader_2 = AsyncMock(return_value=["B1"])
+    assert await worker_2.get_or_load("evt", loader_2) == ["A1"]
+    loader_2.assert_not_awaited()
+
+    await worker_1.invalidate("evt")
+    assert await shared.get("seats:evt") is None
+    assert await worker_1.get("evt") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_failure_falls_back_to_loader():
+    shared = AsyncMock()
+    shared.get = AsyncMock(side_effect=ConnectionError("db down"))
+    shared.set = AsyncMock(side_effect=ConnectionError("db down"))
+    cache = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30, shared=shared)
+
+    assert await cache.get_or_load("evt", AsyncMock(return_value=["A1"])) == ["A1"]
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_outlives_fresh_entry():
+    clock = FakeClock()
+    cache = SeatsCache(
+        local=InMemoryCache(max_entries=10, clock=clock),
+        ttl=30,
+        stale=InMemoryCache(max_entries=10, clock=clock),
+        stale_ttl=600,
+    )
+
+    await cache.get_or_load("evt", AsyncMock(return_value=["A1"]))
+    clock.now = 60
+
+    assert await cache.get("evt") is None
+    assert await cache.get_stale("evt") == ["A1"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_coalesced_waiters():
+    cache = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30)
+    release = asyncio.Event()
+
+    async def loader() -> list[str]:
+        await release.wait()
+        return ["A1"]
+
+    leader = asyncio.create_task(cache.get_or_load("evt", loader))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("evt", loader))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == ["A1"]
+    assert await cache.get("evt") == ["A1"]
+
+
+@pytest.mark.asyncio
+async def test_load_started_before_invalidate_is_not_cached():
+    cache = SeatsCache(local=InMemoryCache(max_entries=10), ttl=30)
+    release = asyncio.Event()
+
+    async def old_loader() -> list[str]:
+        await release.wait()
+        return ["A1", "A2"]
+
+    load = asyncio.create_task(cache.get_or_load("evt", old_loader))
+    await asyncio.sleep(0)
+    # Билет на A1 продан, пока загрузка ещё шла.
+    await cache.invalidate("evt")
+    release.set()
+
+    assert await load == ["A1", "A2"]
+    assert await cache.get("evt") is None
+    assert await cache.get_or_load("evt", AsyncMock(return_value=["A2"])) == ["A2"]
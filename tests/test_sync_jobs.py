@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.routes.sync import _progress
+from src.domain.models import SyncMetadata
+from src.services import sync_jobs
+from src.services.sync_jobs import SyncAlreadyRunning, SyncJobRunner
+
+
+@pytest.mark.asyncio
+async def test_trigger_returns_running_job_instead_of_starting_another(monkeypatch):
+    release = asyncio.Event()
+    calls = 0
+
+    async def fake_sync():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    monkeypatch.setattr(sync_jobs, "run_sync_once", fake_sync)
+    runner = SyncJobRunner()
+
+    first = runner.start()
+    second = runner.start()
+    await asyncio.sleep(0)
+    assert first is second
+    assert first.status == "running"
+
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert calls == 1
+    assert runner.get(first.id).status == "success"
+    assert first.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_job_is_skipped_when_lock_held_elsewhere(monkeypatch):
+    async def locked():
+        raise SyncAlreadyRunning()
+
+    monkeypatch.setattr(sync_jobs, "run_sync_once", locked)
+    runner = SyncJobRunner()
+
+    job = runner.start()
+    await asyncio.sleep(0)
+
+    assert job.status == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(monkeypatch):
+    async def broken():
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(sync_jobs, "run_sync_once", broken)
+    runner = SyncJobRunner()
+
+    job = runner.start()
+    await asyncio.sleep(0)
+
+    assert job.status == "error"
+    assert job.error == "provider down"
+
+
+def test_progress_estimates_eta_from_rate():
+    meta = SyncMetadata(
+        id=1,
+        sync_status="running",
+        last_sync_time=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        pages_synced=4,
+        rows_synced=400,
+        rows_total=1000,
+        rows_per_second=200.0,
+        batch_size=100,
+    )
+
+    progress = _progress(meta)
+
+    assert progress["pages_synced"] == 4
+    assert progress["eta_seconds"] == 3.0
+
+
+def test_progress_without_metadata():
+    assert _progress(None)["status"] == "never"
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.services.sync_jobs import SyncAlreadyRunning
+from src.services.sync_scheduler import SyncScheduler
+
+
+@asynccontextmanager
+async def leader(acquired: bool = True):
+    yield acquired
+
+
+def make_scheduler(run_sync=None, leadership=leader, sleep=None) -> SyncScheduler:
+    async def no_changes() -> int:
+        return 0
+
+    async def no_sleep(_: float) -> None:
+        return None
+
+    return SyncScheduler(
+        run_sync=run_sync or no_changes,
+        leadership=leadership,
+        min_interval=300,
+        max_interval=86_400,
+        busy_changes=1_000,
+        failure_backoff=30,
+        jitter=0.0,
+        sleep=sleep or no_sleep,
+    )
+
+
+def test_busy_run_syncs_at_min_interval():
+    scheduler = make_scheduler()
+
+    assert scheduler.next_interval(5_000) == 300
+
+
+def test_quiet_runs_back_off_gradually_up_to_max():
+    scheduler = make_scheduler()
+
+    intervals = [scheduler.next_interval(0) for _ in range(12)]
+
+    assert intervals[:3] == [600, 1_200, 2_400]
+    assert intervals[-1] == 86_400
+
+
+def test_interval_drops_immediately_when_changes_grow():
+    scheduler = make_scheduler()
+    for _ in range(12):
+        scheduler.next_interval(0)
+
+    moderate = scheduler.next_interval(500)
+
+    # геометрическая середина между 5 минутами и сутками
+    assert moderate == pytest.approx((300 * 86_400) ** 0.5)
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_exponentially_and_reset_on_success():
+    outcomes = [RuntimeError("down"), RuntimeError("down"), RuntimeError("down"), 2_000]
+
+    async def flaky() -> int:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    scheduler = make_scheduler(run_sync=flaky)
+
+    delays = [await scheduler.tick() for _ in range(4)]
+
+    assert delays == [30, 60, 120, 300]
+    assert scheduler.failure_delay() == 30
+
+
+@pytest.mark.asyncio
+async def test_manual_sync_in_progress_is_not_a_failure():
+    async def locked() -> int:
+        raise SyncAlreadyRunning()
+
+    scheduler = make_scheduler(run_sync=locked)
+
+    assert await scheduler.tick() == 300
+    assert scheduler.failure_delay() == 30
+
+
+def test_jitter_stays_within_bounds():
+    scheduler = SyncScheduler(
+        run_sync=None,
+        leadership=leader,
+        min_interval=100,
+        max_interval=100,
+        busy_changes=1,
+        failure_backoff=1,
+        jitter=0.1,
+        rng=lambda: 1.0,
+    )
+
+    assert scheduler._jittered(100) == pytest.approx(110)
+
+
+@pytest.mark.asyncio
+async def test_only_leader_runs_syncs():
+    runs = 0
+
+    async def count() -> int:
+        nonlocal runs
+        runs += 1
+        return 0
+
+    sleeps = []
+
+    async def record_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        if len(sleeps) == 3:
+            raise asyncio.CancelledError()
+
+    scheduler = make_scheduler(
+        run_sync=count,
+        leadership=lambda: leader(False),
+        sleep=record_sleep,
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await scheduler.run()
+
+    assert runs == 0
+    assert sleeps == [60, 60, 60]
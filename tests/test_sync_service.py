@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.domain.models import SyncMetadata
+from src.infrastructure.clients.events_provider import EventsProviderClient
+from src.infrastructure.db.repositories.event_repository import SqlAlchemyEventRepository
+from src.services import sync_service
+from src.services.sync_service import SyncService
+
+
+def make_raw_event(event_id: str, place_id: str, changed_at: str) -> dict:
+    return {
+        "id": event_id,
+        "name": f"Event {event_id}",
+        "event_time": "2026-01-01T19:00:00+00:00",
+        "registration_deadline": "2026-01-01T12:00:00+00:00",
+        "status": "published",
+        "number_of_visitors": 0,
+        "changed_at": changed_at,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "status_changed_at": "2025-01-01T00:00:00+00:00",
+        "place": {
+            "id": place_id,
+            "name": "Hall",
+            "city": "Moscow",
+            "address": "Tverskaya 1",
+            "seats_pattern": "A1-10",
+            "changed_at": "2025-01-01T00:00:00+00:00",
+            "created_at": "2025-01-01T00:00:00+00:00",
+        },
+    }
+
+
+def make_service(pages: list[dict], batch_size: int) -> tuple[SyncService, MagicMock]:
+    client = AsyncMock()
+    all_pages = iter(pages)
+    client.events_since = AsyncMock(side_effect=lambda changed_at: next(all_pages))
+    client.events = AsyncMock(side_effect=lambda cursor_url=None: next(all_pages))
+
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+
+    service = SyncService(client=client, session=session, batch_size=batch_size)
+    service._sync_repo.get_or_create = AsyncMock(return_value=SyncMetadata(id=1))
+    service._event_repo.upsert_places = AsyncMock()
+    service._event_repo.upsert_events = AsyncMock(side_effect=lambda rows: len(rows))
+    return service, session
+
+
+@pytest.mark.asyncio
+async def test_run_writes_events_in_batches():
+    pages = [
+        {
+            "next": "http://fake/page2",
+            "results": [make_raw_event(str(i), "p1", "2025-06-01T00:00:00+00:00") for i in range(3)],
+        },
+        {
+            "next": None,
+            "results": [make_raw_event(str(i), "p1", "2025-06-02T00:00:00+00:00") for i in range(3, 5)],
+        },
+    ]
+    service, _ = make_service(pages, batch_size=2)
+
+    await service.run()
+
+    batches = [call.args[0] for call in service._event_repo.upsert_events.await_args_list]
+    # батч закрывается на границе страницы, как только набран batch_size
+    assert [len(b) for b in batches] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_run_dedupes_places_and_events_within_batch():
+    pages = [
+        {
+            "next": None,
+            "results": [
+                make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00"),
+                make_raw_event("2", "p1", "2025-06-01T00:00:00+00:00"),
+                make_raw_event("1", "p1", "2025-06-03T00:00:00+00:00"),
+            ],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=100)
+
+    await service.run()
+
+    places = service._event_repo.upsert_places.await_args.args[0]
+    events = service._event_repo.upsert_events.await_args.args[0]
+    assert [p["id"] for p in places] == ["p1"]
+    assert sorted(e["id"] for e in events) == ["1", "2"]
+    event_1 = next(e for e in events if e["id"] == "1")
+    assert event_1["changed_at"].day == 3
+
+
+@pytest.mark.asyncio
+async def test_run_records_stats_on_metadata():
+    pages = [
+        {
+            "next": None,
+            "results": [make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00")],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=10)
+    meta = await service._sync_repo.get_or_create()
+
+    await service.run()
+
+    assert meta.sync_status == "success"
+    assert meta.batch_size == 10
+    assert meta.rows_synced == 1
+    assert meta.last_changed_at.day == 1
+    assert meta.sync_version == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_still_bumps_generation_for_committed_batches():
+    pages = [
+        {
+            "next": "http://fake/page2",
+            "results": [make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00")],
+        },
+    ]
+    service, _ = make_service(pages, batch_size=1)
+    service._client.events = AsyncMock(side_effect=httpx.ConnectError("reset"))
+    meta = await service._sync_repo.get_or_create()
+
+    with pytest.raises(httpx.ConnectError):
+        await service.run()
+
+    # Первый батч закоммичен — индекс статусов должен его перечитать.
+    assert meta.sync_status == "error"
+    assert meta.sync_version == 1
+
+
+@pytest.mark.asyncio
+async def test_run_tracks_pages_and_expected_total():
+    pages = [
+        {
+            "count": 3,
+            "next": "http://fake/page2",
+            "results": [make_raw_event(str(i), "p1", "2025-06-01T00:00:00+00:00") for i in range(2)],
+        },
+        {
+            "count": 3,
+            "next": None,
+            "results": [make_raw_event("2", "p1", "2025-06-02T00:00:00+00:00")],
+        },
+    ]
+    service, _ = make_service(pages, batch_size=1)
+    meta = await service._sync_repo.get_or_create()
+
+    await service.run()
+
+    assert meta.pages_synced == 2
+    assert meta.rows_synced == 3
+    assert meta.rows_total == 3
+
+
+@pytest.mark.asyncio
+async def test_run_saves_checkpoint_after_each_batch_and_clears_on_success():
+    pages = [
+        {
+            "next": "http://fake/page2",
+            "results": [make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00")],
+        },
+        {
+            "next": None,
+            "results": [make_raw_event("2", "p1", "2025-06-02T00:00:00+00:00")],
+        },
+    ]
+    service, session = make_service(pages, batch_size=1)
+    meta = await service._sync_repo.get_or_create()
+
+    checkpoints = []
+    session.commit = AsyncMock(side_effect=lambda: checkpoints.append(meta.cursor_url))
+
+    await service.run()
+
+    assert "http://fake/page2" in checkpoints
+    assert meta.cursor_url is None
+    assert meta.cursor_changed_at is None
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_checkpoint_after_crash():
+    pages = [
+        {
+            "next": "http://fake/page2",
+            "results": [make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00")],
+        },
+    ]
+    service, _ = make_service(pages, batch_size=1)
+    service._client.events = AsyncMock(side_effect=RuntimeError("provider down"))
+    meta = await service._sync_repo.get_or_create()
+
+    with pytest.raises(RuntimeError):
+        await service.run()
+
+    assert meta.sync_status == "error"
+    assert meta.cursor_url == "http://fake/page2"
+    assert meta.cursor_changed_at.day == 1
+
+    service._client.events = AsyncMock(
+        return_value={
+            "next": None,
+            "results": [make_raw_event("2", "p1", "2025-06-02T00:00:00+00:00")],
+        }
+    )
+    service._client.events_since.reset_mock()
+
+    await service.run()
+
+    service._client.events.assert_awaited_once_with(cursor_url="http://fake/page2")
+    service._client.events_since.assert_not_awaited()
+    assert meta.sync_status == "success"
+    assert meta.last_changed_at.day == 2
+    # счётчики прогресса продолжились с чекпоинта, а не обнулились
+    assert meta.pages_synced == 2
+    assert meta.rows_synced == 2
+
+
+@pytest.mark.asyncio
+async def test_resumed_run_rate_counts_only_rows_of_this_run(monkeypatch):
+    pages = [
+        {
+            "next": None,
+            "results": [
+                make_raw_event(str(i), "p1", "2025-06-02T00:00:00+00:00") for i in range(4)
+            ],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=10)
+    meta = await service._sync_repo.get_or_create()
+    meta.cursor_url = "http://fake/page7"
+    meta.rows_synced = 600
+    clock = iter([100.0, 102.0])
+    monkeypatch.setattr(sync_service, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    await service.run()
+
+    assert meta.rows_synced == 604
+    assert meta.rows_per_second == 2.0
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_uses_precise_watermark_with_overlap():
+    pages = [
+        {
+            "next": None,
+            "results": [
+                make_raw_event("b", "p1", "2025-06-05T10:00:00+00:00"),
+                make_raw_event("a", "p1", "2025-06-05T10:00:00+00:00"),
+            ],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=10)
+    meta = await service._sync_repo.get_or_create()
+    meta.last_changed_at = datetime(2025, 6, 5, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+    await service.run()
+
+    since = service._client.events_since.await_args.args[0]
+    assert since == (
+        datetime(2025, 6, 5, 9, 30, 15, 123456, tzinfo=timezone.utc)
+        - timedelta(seconds=service._overlap_seconds)
+    ).isoformat()
+    assert meta.last_changed_at == datetime(2025, 6, 5, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_watermark_never_moves_backwards():
+    pages = [
+        {
+            "next": None,
+            "results": [make_raw_event("1", "p1", "2025-06-01T00:00:00+00:00")],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=10)
+    meta = await service._sync_repo.get_or_create()
+    meta.last_changed_at = datetime(2025, 6, 1, 0, 2, tzinfo=timezone.utc)
+
+    await service.run()
+
+    assert meta.last_changed_at == datetime(2025, 6, 1, 0, 2, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_late_rows_inside_overlap_window_are_still_written():
+    pages = [
+        {
+            "next": None,
+            "results": [make_raw_event("late", "p1", "2025-06-01T00:01:00+00:00")],
+        }
+    ]
+    service, _ = make_service(pages, batch_size=10)
+    meta = await service._sync_repo.get_or_create()
+    meta.last_changed_at = datetime(2025, 6, 1, 0, 2, tzinfo=timezone.utc)
+
+    await service.run()
+
+    events = service._event_repo.upsert_events.await_args.args[0]
+    assert [e["id"] for e in events] == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_skips_rows_whose_changed_at_did_not_advance():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+    repo = SqlAlchemyEventRepository(session)
+
+    assert await repo.upsert_events([{"id": "1"}]) == 0
+
+    stmt = session.execute.await_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "WHERE events.changed_at < excluded.changed_at" in sql
+    assert "RETURNING events.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_run_reports_only_rows_the_upsert_changed():
+    changed_at = "2025-06-01T00:00:00+00:00"
+    pages = [
+        {
+            "next": "http://fake/page2",
+            "results": [make_raw_event(str(i), "p1", changed_at) for i in range(2)],
+        },
+        {
+            "next": None,
+            "results": [make_raw_event(str(i), "p1", changed_at) for i in range(2, 4)],
+        },
+    ]
+    service, _ = make_service(pages, batch_size=2)
+    # Провайдер отдал 4 строки, но из-за перекрытия водяного знака
+    # changed_at вырос только у одной.
+    service._event_repo.upsert_events = AsyncMock(side_effect=[0, 1])
+
+    assert await service.run() == 1
+    assert service._sync_repo.get_or_create.return_value.rows_synced == 4
+
+
+@pytest.mark.asyncio
+async def test_streaming_run_flushes_mid_page_and_checkpoints_current_page():
+    first_url = "http://fake/api/events/?changed_at=2000-01-01"
+    bodies = {
+        first_url: {
+            "count": 4,
+            "next": "http://fake/page2",
+            "results": [make_raw_event(str(i), "p1", "2025-06-01T00:00:00+00:00") for i in range(3)],
+        },
+        "http://fake/page2": {
+            "count": 4,
+            "next": None,
+            "results": [make_raw_event("3", "p1", "2025-06-02T00:00:00+00:00")],
+        },
+    }
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=bodies[str(request.url)])
+
+    client = EventsProviderClient(
+        base_url="http://fake",
+        api_key="key",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    service, session = make_service([], batch_size=2)
+    service._client = client
+    service._stream = True
+    meta = await service._sync_repo.get_or_create()
+    checkpoints = []
+    session.commit = AsyncMock(
+        side_effect=lambda: checkpoints.append((meta.cursor_url, meta.rows_synced))
+    )
+
+    await service.run()
+
+    batches = [call.args[0] for call in service._event_repo.upsert_events.await_args_list]
+    assert [len(b) for b in batches] == [2, 2]
+    # после батча посреди первой страницы чекпоинт остаётся на ней самой, а её
+    # строки не засчитаны: после resume страница будет прочитана заново
+    assert checkpoints[1] == (first_url, 0)
+    assert ("http://fake/page2", 3) in checkpoints
+    assert meta.rows_synced == 4
+    assert meta.rows_total == 4
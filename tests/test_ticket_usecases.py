@@ -0,0 +1,513 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.domain.models import Base, Event, Place, Ticket, TicketOutbox
+from src.infrastructure.clients.resilience import (
+    ProviderRejected,
+    ProviderTemporaryError,
+    ProviderUnavailable,
+)
+from src.infrastructure.db.repositories.event_repository import SqlAlchemyEventRepository
+from src.infrastructure.db.repositories.outbox_repository import SqlAlchemyTicketOutboxRepository
+from src.infrastructure.db.repositories.ticket_repository import SqlAlchemyTicketRepository
+from src.services.ticket_outbox import TicketOutboxDispatcher
+from src.usecases.tickets import (
+    BatchCancelTicketsUsecase,
+    BatchCreateTicketsUsecase,
+    CancelTicketUsecase,
+    CreateTicketUsecase,
+    EnqueueTicketUsecase,
+    TicketRegistrationPending,
+    TicketRegistrationUnknown,
+)
+
+pytest.importorskip("aiosqlite")
+
+NOW = datetime.now(timezone.utc)
+
+
+class SlowProvider:
+    """Провайдер, который отвечает только после release."""
+
+    def __init__(self) -> None:
+        self.called = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def register(self, event_id, first_name, last_name, email, seat) -> str:
+        self.called.set()
+        await self.release.wait()
+        return "provider-ticket-1"
+
+    async def unregister(self, event_id, ticket_id) -> bool:
+        self.called.set()
+        await self.release.wait()
+        return True
+
+
+@pytest.fixture
+async def sessions(tmp_path):
+    # Один коннект на весь пул: любой удержанный коннект заблокирует соседей.
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'tickets.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                Place.__table__, Event.__table__, Ticket.__table__, TicketOutbox.__table__
+            ],
+        )
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(Place(
+            id="p1", name="Hall", city="Moscow", address="Tverskaya 1",
+            seats_pattern="A1-10", changed_at=NOW, created_at=NOW,
+        ))
+        session.add(Event(
+            id="evt", name="Concert", event_time=NOW + timedelta(days=2),
+            registration_deadline=NOW + timedelta(days=1), status="published",
+            number_of_visitors=0, changed_at=NOW, created_at=NOW,
+            status_changed_at=NOW, place_id="p1",
+        ))
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def count_tickets(factory) -> int:
+    async with factory() as other:
+        return await asyncio.wait_for(other.scalar(select(func.count(Ticket.id))), timeout=2)
+
+
+@pytest.mark.asyncio
+async def test_create_ticket_does_not_hold_connection_during_provider_call(sessions):
+    provider = SlowProvider()
+    async with sessions() as session:
+        usecase = CreateTicketUsecase(
+            client=provider,
+            events=SqlAlchemyEventRepository(session),
+            tickets=SqlAlchemyTicketRepository(session),
+            transaction=session,
+        )
+        task = asyncio.create_task(
+            usecase.execute("evt", "Ivan", "Ivanov", "ivan@example.com", "A1")
+        )
+        await provider.called.wait()
+
+        # Пока провайдер думает, единственное соединение пула свободно.
+        assert await count_tickets(sessions) == 0
+
+        provider.release.set()
+        assert await task == "provider-ticket-1"
+        await session.commit()
+
+    assert await count_tickets(sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_ticket_does_not_hold_connection_during_provider_call(sessions):
+    async with sessions() as session:
+        await SqlAlchemyTicketRepository(session).create(
+            "evt", "provider-ticket-1", "Ivan", "Ivanov", "ivan@example.com", "A1"
+        )
+        await session.commit()
+
+    provider = SlowProvider()
+    async with sessions() as session:
+        usecase = CancelTicketUsecase(
+            client=provider,
+            tickets=SqlAlchemyTicketRepository(session),
+            transaction=session,
+        )
+        task = asyncio.create_task(usecase.execute("provider-ticket-1"))
+        await provider.called.wait()
+
+        assert await count_tickets(sessions) == 1
+
+        provider.release.set()
+        assert await task == "evt"
+        await session.commit()
+
+    assert await count_tickets(sessions) == 0
+
+
+class CountingProvider:
+    def __init__(self, fail_seats: set[str]) -> None:
+        self.fail_seats = fail_seats
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.unregistered: list[str] = []
+
+    async def register(self, event_id, first_name, last_name, email, seat) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if seat in self.fail_seats:
+            raise ProviderRejected(f"Register failed: 409 seat {seat} taken")
+        return f"provider-{seat}"
+
+    async def unregister(self, event_id, ticket_id) -> bool:
+        self.unregistered.append(ticket_id)
+        return True
+
+
+def attendees(count: int) -> list[dict]:
+    return [
+        {"first_name": "Ivan", "last_name": f"N{i}", "email": f"i{i}@example.com", "seat": f"A{i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_fans_out_with_bounded_concurrency_and_one_insert(sessions):
+    provider = CountingProvider(fail_seats={"A2"})
+    inserts = []
+    engine = sessions.kw["bind"]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tickets"):
+            inserts.append(statement)
+
+    async with sessions() as session:
+        usecase = BatchCreateTicketsUsecase(
+            client=provider,
+            events=SqlAlchemyEventRepository(session),
+            tickets=SqlAlchemyTicketRepository(session),
+            concurrency=3,
+            transaction=session,
+        )
+        results = await usecase.execute("evt", attendees(6))
+        await session.commit()
+
+    assert provider.max_in_flight == 3
+    assert [r.seat for r in results] == ["A1", "A2", "A3", "A4", "A5", "A6"]
+    assert results[1].ticket_id is None and "taken" in results[1].error
+    assert results[0].ticket_id == "provider-A1"
+    assert len(inserts) == 1
+    assert await count_tickets(sessions) == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_releases_provider_seats_when_insert_fails():
+    provider = CountingProvider(fail_seats=set())
+    tickets = SimpleNamespace(create_many=AsyncMock(side_effect=RuntimeError("db down")))
+    statuses = SimpleNamespace(
+        get=lambda event_id: SimpleNamespace(
+            status="published", registration_deadline=NOW + timedelta(days=1)
+        )
+    )
+    usecase = BatchCreateTicketsUsecase(
+        client=provider, events=None, tickets=tickets, concurrency=5, statuses=statuses
+    )
+
+    with pytest.raises(RuntimeError):
+        await usecase.execute("evt", attendees(2))
+
+    assert sorted(provider.unregistered) == ["provider-A1", "provider-A2"]
+
+
+@pytest.mark.asyncio
+async def test_batch_cancel_deletes_successes_and_reports_failures(sessions):
+    async with sessions() as session:
+        repo = SqlAlchemyTicketRepository(session)
+        for seat in ("A1", "A2", "A3"):
+            await repo.create("evt", f"provider-{seat}", "Ivan", "Ivanov", "i@example.com", seat)
+        await session.commit()
+
+    class FlakyProvider(CountingProvider):
+        async def unregister(self, event_id, ticket_id) -> bool:
+            if ticket_id == "provider-A2":
+                raise ValueError("Unregister failed: 500")
+            return await super().unregister(event_id, ticket_id)
+
+    provider = FlakyProvider(fail_seats=set())
+    statements = []
+    engine = sessions.kw["bind"]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    async with sessions() as session:
+        usecase = BatchCancelTicketsUsecase(
+            client=provider,
+            tickets=SqlAlchemyTicketRepository(session),
+            concurrency=2,
+            transaction=session,
+        )
+        results = await usecase.execute(["provider-A1", "provider-A2", "provider-A3", "missing"])
+        await session.commit()
+
+    assert [(r.ticket_id, r.error) for r in results] == [
+        ("provider-A1", None),
+        ("provider-A2", "Unregister failed: 500"),
+        ("provider-A3", None),
+        ("missing", "Ticket not found"),
+    ]
+    assert sorted(provider.unregistered) == ["provider-A1", "provider-A3"]
+    assert statements.count("SELECT") == 1
+    assert statements.count("DELETE") == 1
+    assert await count_tickets(sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_cancel_makes_one_provider_call_per_ticket_aliases(sessions):
+    async with sessions() as session:
+        ticket = await SqlAlchemyTicketRepository(session).create(
+            "evt", "provider-A1", "Ivan", "Ivanov", "i@example.com", "A1"
+        )
+        await session.commit()
+
+    provider = CountingProvider(set())
+    async with sessions() as session:
+        usecase = BatchCancelTicketsUsecase(
+            client=provider,
+            tickets=SqlAlchemyTicketRepository(session),
+            concurrency=2,
+            transaction=session,
+        )
+        results = await usecase.execute([ticket.id, "provider-A1"])
+        await session.commit()
+
+    assert [(r.ticket_id, r.error) for r in results] == [
+        (ticket.id, None),
+        ("provider-A1", None),
+    ]
+    assert provider.unregistered == ["provider-A1"]
+    assert await count_tickets(sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_ticket_releases_seat_when_local_insert_fails(sessions):
+    provider = CountingProvider(set())
+
+    class BrokenTickets:
+        async def create(self, **ticket) -> None:
+            raise RuntimeError("insert failed")
+
+    async with sessions() as session:
+        usecase = CreateTicketUsecase(
+            client=provider,
+            events=SqlAlchemyEventRepository(session),
+            tickets=BrokenTickets(),
+            transaction=session,
+        )
+        with pytest.raises(RuntimeError):
+            await usecase.execute("evt", "Ivan", "Ivanov", "ivan@example.com", "A1")
+
+    assert provider.unregistered == ["provider-A1"]
+
+
+async def enqueue(factory, seats: list[str]) -> list[str]:
+    local_ids = []
+    async with factory() as session:
+        usecase = EnqueueTicketUsecase(
+            events=SqlAlchemyEventRepository(session),
+            tickets=SqlAlchemyTicketRepository(session),
+            outbox=SqlAlchemyTicketOutboxRepository(session),
+        )
+        for seat in seats:
+            local_ids.append(
+                await usecase.execute("evt", "Ivan", "Ivanov", "ivan@example.com", seat)
+            )
+        await session.commit()
+    return local_ids
+
+
+def make_dispatcher(factory, provider, **kwargs) -> TicketOutboxDispatcher:
+    options = {
+        "batch_size": 10,
+        "concurrency": 2,
+        "lease_seconds": 60,
+        "retry_backoff": 60,
+        "max_attempts": 3,
+    }
+    options.update(kwargs)
+    return TicketOutboxDispatcher(factory, client=provider, **options)
+
+
+async def load_ticket(factory, local_id: str) -> Ticket:
+    async with factory() as session:
+        return await session.get(Ticket, local_id)
+
+
+async def outbox_size(factory) -> int:
+    async with factory() as session:
+        return await session.scalar(select(func.count(TicketOutbox.id)))
+
+
+@pytest.mark.asyncio
+async def test_outbox_dispatcher_registers_pending_tickets(sessions):
+    local_ids = await enqueue(sessions, ["A1", "A2", "A3", "A4", "A5"])
+    assert (await load_ticket(sessions, local_ids[0])).status == "pending"
+
+    provider = CountingProvider(fail_seats={"A3"})
+    registered_events = []
+
+    async def on_registered(event_id: str) -> None:
+        registered_events.append(event_id)
+
+    dispatcher = make_dispatcher(sessions, provider, on_registered=on_registered)
+
+    assert await dispatcher.drain_once() == 5
+
+    first = await load_ticket(sessions, local_ids[0])
+    assert (first.status, first.ticket_id) == ("registered", "provider-A1")
+    rejected = await load_ticket(sessions, local_ids[2])
+    assert rejected.status == "failed" and "taken" in rejected.error
+    assert provider.max_in_flight == 2
+    assert registered_events == ["evt"] * 4
+    assert await outbox_size(sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_dispatcher_retries_transient_errors_then_gives_up(sessions):
+    [local_id] = await enqueue(sessions, ["A1"])
+
+    class DownProvider(CountingProvider):
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            raise httpx.ConnectError("connection refused")
+
+    dispatcher = make_dispatcher(
+        sessions, DownProvider(set()), batch_size=1, retry_backoff=0, max_attempts=2
+    )
+
+    assert await dispatcher.drain_once() == 1
+    ticket = await load_ticket(sessions, local_id)
+    assert ticket.status == "pending"
+    assert await outbox_size(sessions) == 1
+
+    assert await dispatcher.drain_once() == 1
+    ticket = await load_ticket(sessions, local_id)
+    assert (ticket.status, ticket.error) == ("failed", "connection refused")
+    assert await outbox_size(sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_does_not_reregister_after_ambiguous_timeout(sessions):
+    [local_id] = await enqueue(sessions, ["A1"])
+
+    class LostResponseProvider(CountingProvider):
+        calls = 0
+
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            # Провайдер занял место, но ответ до нас не дошёл.
+            self.calls += 1
+            raise TimeoutError()
+
+    provider = LostResponseProvider(set())
+    dispatcher = make_dispatcher(sessions, provider, retry_backoff=0)
+
+    assert await dispatcher.drain_once() == 1
+    assert await dispatcher.drain_once() == 0
+
+    ticket = await load_ticket(sessions, local_id)
+    assert (ticket.status, ticket.error) == ("unknown", "TimeoutError")
+    assert provider.calls == 1
+    async with sessions() as session:
+        with pytest.raises(TicketRegistrationUnknown):
+            await CancelTicketUsecase(
+                client=provider, tickets=SqlAlchemyTicketRepository(session)
+            ).execute(local_id)
+
+
+@pytest.mark.asyncio
+async def test_outbox_dispatcher_retries_provider_5xx(sessions):
+    [local_id] = await enqueue(sessions, ["A1"])
+
+    class FlakyProvider(CountingProvider):
+        calls = 0
+
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                raise ProviderTemporaryError("Register failed: 503 busy", 503)
+            return f"provider-{seat}"
+
+    dispatcher = make_dispatcher(sessions, FlakyProvider(set()), batch_size=1, retry_backoff=0)
+
+    assert await dispatcher.drain_once() == 1
+    assert (await load_ticket(sessions, local_id)).status == "pending"
+
+    assert await dispatcher.drain_once() == 1
+    ticket = await load_ticket(sessions, local_id)
+    assert (ticket.status, ticket.ticket_id) == ("registered", "provider-A1")
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_does_not_use_up_attempts(sessions):
+    [local_id] = await enqueue(sessions, ["A1"])
+
+    class BrokenProvider(CountingProvider):
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            raise ProviderUnavailable("breaker open")
+
+    dispatcher = make_dispatcher(
+        sessions, BrokenProvider(set()), batch_size=1, retry_backoff=0, max_attempts=1
+    )
+
+    for _ in range(3):
+        assert await dispatcher.drain_once() == 1
+
+    assert (await load_ticket(sessions, local_id)).status == "pending"
+    async with sessions() as session:
+        entry = await session.scalar(select(TicketOutbox))
+    assert (entry.attempts, entry.last_error) == (0, "breaker open")
+
+
+@pytest.mark.asyncio
+async def test_entries_waiting_for_a_free_slot_are_not_leased(sessions):
+    await enqueue(sessions, ["A1", "A2", "A3"])
+    ready_during_calls = []
+
+    class InspectingProvider(CountingProvider):
+        async def register(self, event_id, first_name, last_name, email, seat) -> str:
+            async with sessions() as session:
+                ready_during_calls.append(await session.scalar(
+                    select(func.count(TicketOutbox.id))
+                    .where(TicketOutbox.next_attempt_at <= datetime.now(timezone.utc))
+                ))
+            return f"provider-{seat}"
+
+    dispatcher = make_dispatcher(sessions, InspectingProvider(set()), concurrency=1)
+
+    assert await dispatcher.drain_once() == 3
+    # Аренда берётся на запись перед вызовом, остальные остаются доступными.
+    assert ready_during_calls == [2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_claimed_entries_are_leased(sessions):
+    await enqueue(sessions, ["A1"])
+    async with sessions() as session:
+        assert len(await SqlAlchemyTicketOutboxRepository(session).claim(10, 60)) == 1
+        await session.commit()
+    async with sessions() as session:
+        assert await SqlAlchemyTicketOutboxRepository(session).claim(10, 60) == []
+
+
+@pytest.mark.asyncio
+async def test_pending_ticket_cannot_be_cancelled(sessions):
+    [local_id] = await enqueue(sessions, ["A1"])
+
+    async with sessions() as session:
+        usecase = CancelTicketUsecase(
+            client=CountingProvider(set()),
+            tickets=SqlAlchemyTicketRepository(session),
+        )
+        with pytest.raises(TicketRegistrationPending):
+            await usecase.execute(local_id)